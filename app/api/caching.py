@@ -0,0 +1,74 @@
+"""Conditional GET support (ETag / Cache-Control) for read-only API routes."""
+
+import hashlib
+from typing import Any, Callable, Coroutine, TypeVar
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_MAX_AGE_ATTR = "__cache_max_age__"
+
+
+def cacheable(max_age: int = 5) -> Callable[[F], F]:
+    """
+    Mark a GET endpoint as safe to revalidate with an ETag.
+
+    The endpoint itself is returned unchanged; `ConditionalGetRoute` reads the
+    marker when the route is registered.
+    """
+
+    def decorator(func: F) -> F:
+        setattr(func, _MAX_AGE_ATTR, max_age)
+        return func
+
+    return decorator
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Check an If-None-Match header value against the current ETag."""
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        candidate.strip().removeprefix("W/") == etag
+        for candidate in if_none_match.split(",")
+    )
+
+
+class ConditionalGetRoute(APIRoute):
+    """
+    Route class adding ETag and Cache-Control headers to `cacheable` endpoints.
+
+    The ETag is a short blake2b digest of the rendered body, so it is computed
+    from the bytes already produced for the response. A matching If-None-Match
+    request gets an empty 304 instead of the payload.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+        max_age = getattr(self.endpoint, _MAX_AGE_ATTR, None)
+        if max_age is None:
+            return handler
+
+        cache_control = f"private, max-age={max_age}"
+
+        async def conditional_handler(request: Request) -> Response:
+            response = await handler(request)
+            if (
+                request.method != "GET"
+                or response.status_code != 200
+                or not hasattr(response, "body")
+            ):
+                return response
+
+            etag = f'"{hashlib.blake2b(response.body, digest_size=8).hexdigest()}"'
+            headers = {"ETag": etag, "Cache-Control": cache_control}
+            if_none_match = request.headers.get("if-none-match")
+            if if_none_match and _etag_matches(if_none_match, etag):
+                return Response(status_code=304, headers=headers)
+
+            response.headers.update(headers)
+            return response
+
+        return conditional_handler
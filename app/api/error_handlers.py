@@ -1,64 +1,42 @@
-"""Utility functions for handling exceptions in API routes."""
+"""Exception handlers turning errors raised in API routes into responses."""
 
 import logging
-from functools import wraps
-from typing import Any, Awaitable, Callable, TypeVar
 
-from fastapi import HTTPException
+from fastapi import FastAPI, Request
+from fastapi.responses import ORJSONResponse
 
 from app.exceptions.exceptions import AppException
 
 logger = logging.getLogger(__name__)
 
-T = TypeVar("T")
 
+async def app_exception_handler(request: Request, exc: AppException) -> ORJSONResponse:
+    """Convert application exceptions raised anywhere in a route to HTTP responses."""
+    logger.warning(
+        "Application exception on %s %s: %s",
+        request.method,
+        request.url.path,
+        exc.message,
+    )
+    return ORJSONResponse(status_code=exc.status_code, content={"detail": exc.message})
 
-def handle_service_exceptions(
-    func: Callable[..., Awaitable[T]],
-) -> Callable[..., Awaitable[T]]:
-    """
-    Decorator to handle service exceptions and convert them to HTTP exceptions.
-
-    This decorator should be used on router endpoint functions to automatically
-    convert application exceptions to appropriate HTTP responses.
-    """
-
-    @wraps(func)
-    async def wrapper(*args: Any, **kwargs: Any) -> T:
-        try:
-            return await func(*args, **kwargs)
-        except AppException as e:
-            logger.warning(f"Application exception in {func.__name__}: {e.message}")
-            raise HTTPException(status_code=e.status_code, detail=e.message)
-        except HTTPException:
-            # Re-raise HTTPExceptions as they are already properly formatted
-            raise
-        except Exception as e:
-            logger.error(
-                f"Unexpected error in {func.__name__}: {str(e)}", exc_info=True
-            )
-            raise HTTPException(
-                status_code=500, detail=f"Internal server error: {str(e)}"
-            )
 
-    return wrapper
+async def unhandled_exception_handler(
+    request: Request, exc: Exception
+) -> ORJSONResponse:
+    """Catch-all handler turning unexpected errors into a 500 response."""
+    logger.error(
+        "Unexpected error on %s %s", request.method, request.url.path, exc_info=exc
+    )
+    return ORJSONResponse(status_code=500, content={"detail": "Internal server error"})
 
 
-async def execute_with_error_handling(
-    operation: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any
-) -> T:
+def register_exception_handlers(app: FastAPI) -> None:
     """
-    Execute an operation with proper error handling.
+    Register the application-wide exception handlers once at startup.
 
-    This function can be used directly in router endpoints for more fine-grained control.
+    Exceptions raised by routes propagate to these handlers, which turn them
+    into JSON error responses.
     """
-    try:
-        return await operation(*args, **kwargs)
-    except AppException as e:
-        logger.warning(f"Application exception: {e.message}")
-        raise HTTPException(status_code=e.status_code, detail=e.message)
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Unexpected error: {str(e)}", exc_info=True)
-        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+    app.add_exception_handler(AppException, app_exception_handler)  # type: ignore[arg-type]
+    app.add_exception_handler(Exception, unhandled_exception_handler)
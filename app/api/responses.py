@@ -0,0 +1,20 @@
+"""JSON responses for routes whose content is already typed."""
+
+from fastapi import Response
+from pydantic import BaseModel
+
+
+def json_response(content: bytes) -> Response:
+    """
+    Wrap JSON bytes serialized by pydantic in a Response.
+
+    Routes returning a Response skip FastAPI's re-validation of the content
+    against their response_model (still declared for the OpenAPI schema) and
+    its jsonable_encoder pass.
+    """
+    return Response(content=content, media_type="application/json")
+
+
+def model_response(model: BaseModel) -> Response:
+    """Serialize a response model straight to JSON bytes in a Response."""
+    return json_response(model.__pydantic_serializer__.to_json(model))
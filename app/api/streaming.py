@@ -0,0 +1,30 @@
+"""Streaming response for routes whose content is already encoded."""
+
+from typing import AsyncIterable
+
+from fastapi.responses import StreamingResponse
+from starlette.types import Send
+
+
+class BytesStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse for async iterators that yield bytes.
+
+    Each chunk is sent as is, skipping the per-chunk type check and encode of
+    `StreamingResponse`. Client disconnects and the background task are still
+    handled by Starlette.
+    """
+
+    body_iterator: AsyncIterable[bytes]
+
+    async def stream_response(self, send: Send) -> None:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": self.status_code,
+                "headers": self.raw_headers,
+            }
+        )
+        async for chunk in self.body_iterator:
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
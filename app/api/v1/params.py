@@ -1,4 +1,18 @@
-from fastapi import Path
+import pathlib
+from functools import cached_property
+from typing import Annotated
+
+from fastapi import Path, Query
+
+# Shared query/path parameter types, declared once and reused by the routers.
+SkipParam = Annotated[int, Query(ge=0, description="Number of items to skip")]
+LimitParam = Annotated[
+    int, Query(ge=1, le=1000, description="Maximum number of items to return")
+]
+ActiveOnlyParam = Annotated[bool, Query(description="Only return active items")]
+SSHKeyIdParam = Annotated[int, Path(description="SSH key ID")]
+TemplateIdParam = Annotated[int, Path(description="Task template ID")]
+TaskIdParam = Annotated[int, Path(description="Task execution ID")]
 
 
 class ProjectParams:
@@ -20,6 +34,7 @@ class ProjectWorkspaceParams:
     contains:
     - project: The name of the project, must match the pattern `^[A-Za-z0-9_-]+$`.
     - workspace: The name of the workspace, must match the pattern `^[A-Za-z0-9_-]+$`.
+    - project_path: The project's terraform directory, built on first access.
     """
 
     def __init__(
@@ -37,3 +52,7 @@ class ProjectWorkspaceParams:
     ):
         self.project = project
         self.workspace = workspace
+
+    @cached_property
+    def project_path(self) -> pathlib.Path:
+        return pathlib.Path("infra", self.project, "infra", "terraform")
@@ -1,40 +1,74 @@
+from contextlib import contextmanager
+from typing import Iterator
+
 from fastapi import APIRouter, Depends, HTTPException
 
+from app.api.caching import ConditionalGetRoute, cacheable
 from app.api.v1.params import ProjectParams
-from app.exceptions.exceptions import TerraformInitError
+from app.exceptions.exceptions import EntityNotFoundError
 from app.schemas import ProjectDetailResponse, ProjectListResponse
 from app.services import project_services
 
-router = APIRouter(prefix="/projects", tags=["Projects"])
+router = APIRouter(
+    prefix="/projects", tags=["Projects"], route_class=ConditionalGetRoute
+)
+
 
+@contextmanager
+def _project_lookup(project: str) -> Iterator[None]:
+    """
+    Report a missing project directory as a 404.
 
-@router.get("/", response_model=ProjectListResponse)
+    The services' errors name the path on the server, so the response gets a
+    fixed message instead.
+    """
+    try:
+        yield
+    except (FileNotFoundError, NotADirectoryError) as err:
+        raise EntityNotFoundError(f"Project {project} not found.") from err
+
+
+# Project listings are built by the services from the infra directory, so they
+# are created with model_construct and the route declares the model under
+# `responses` instead of `response_model`, which would validate them again.
+@router.get("/", response_model=None, responses={200: {"model": ProjectListResponse}})
+@cacheable()
 async def get_projects():
     """
     List all projects.
     """
     projects = await project_services.get_projects()
-    return ProjectListResponse(projects=projects)
+    return ProjectListResponse.model_construct(projects=projects)
 
 
 @router.get("/{project}", response_model=ProjectDetailResponse, responses={404: {}})
+@cacheable()
 async def get_project(params: ProjectParams = Depends()):
     """
     Get project details with the tfvars.
     """
-    project = await project_services.get_project(params.project)
-    tfvars = await project_services.get_tfvars(params.project)
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
+    with _project_lookup(params.project):
+        project = await project_services.get_project(params.project)
+        if not project:
+            raise HTTPException(status_code=404, detail="Project not found")
+        tfvars = await project_services.get_tfvars(params.project)
     return ProjectDetailResponse(project=project, tfvars=tfvars)
 
 
 @router.get("/{project}/variablesForm", response_model=dict, responses={404: {}})
+@cacheable()
 async def get_project_variables_form(params: ProjectParams = Depends()):
     """
     Get project variables form.
     """
-    project = await project_services.get_project_variables_form(params.project)
+    with _project_lookup(params.project):
+        await project_services.check_project_exists(params.project)
+    try:
+        project = await project_services.get_project_variables_form(params.project)
+    except FileNotFoundError as err:
+        raise EntityNotFoundError(
+            f"Variables file not found for project {params.project}."
+        ) from err
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     return project
@@ -53,26 +87,12 @@ async def init_project(
     We will add options in the near future to customize the init command
     like adding -reconfigure or -upgrade option.
     """
-    try:
+    with _project_lookup(params.project):
         await project_services.check_project_exists(params.project)
-        await project_services.init_project(
-            params.project,
-            reconfigure=reconfigure,
-            upgrade=upgrade,
-            migrate_state=migrate_state,
-        )
-    except (FileNotFoundError, NotADirectoryError) as err:
-        raise HTTPException(
-            status_code=404,
-            detail=str(err),
-        ) from err
-    except TerraformInitError as err:
-        raise HTTPException(
-            status_code=400,
-            detail=(
-                str(err)
-                + " Use the reconfigure, upgrade, or migrate_state options to fix the issue."  # noqa: E501
-                " If not sure, please contact the administrator to check the log message."  # noqa: E501
-            ),
-        ) from err
+    await project_services.init_project(
+        params.project,
+        reconfigure=reconfigure,
+        upgrade=upgrade,
+        migrate_state=migrate_state,
+    )
     return f"Project {params.project} initialized"
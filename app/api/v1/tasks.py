@@ -1,12 +1,21 @@
 """API endpoints for managing task templates and task executions."""
 
-from typing import Optional
+from typing import Optional, TypedDict
 
 from fastapi import APIRouter, Depends, HTTPException, Path, Query
 from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.error_handlers import handle_service_exceptions
+from app.api.caching import ConditionalGetRoute, cacheable
+from app.api.responses import json_response, model_response
+from app.api.v1.params import (
+    ActiveOnlyParam,
+    LimitParam,
+    SkipParam,
+    TaskIdParam,
+    TemplateIdParam,
+)
 from app.databases.database import get_db_session
 from app.schemas.task_schema import (
     TaskCreate,
@@ -16,21 +25,58 @@ from app.schemas.task_schema import (
     TaskTemplateResponse,
     TaskTemplateUpdate,
 )
-from app.services.task_execution_service import TaskExecutionService
+from app.services.task_execution_service import TaskExecutionService, sse_event
 from app.services.task_template_service import TaskTemplateService
 
+_SSE_STARTING = sse_event("starting", "🚀 Initializing task execution...")
+_SSE_STREAM_END = sse_event("stream_end", "Stream completed")
+_SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Headers": "*",
+}
+
 router = APIRouter(
     prefix="/tasks",
     tags=["Task Management"],
+    route_class=ConditionalGetRoute,
 )
 
+
+class TaskExecutionPage(TypedDict):
+    """A page of task executions with the total number of matching tasks."""
+
+    tasks: list[TaskResponse]
+    total: int
+    skip: int
+    limit: int
+
+
+_task_execution_page = TypeAdapter(TaskExecutionPage)
+
+
+def get_task_template_service(
+    db: AsyncSession = Depends(get_db_session),
+) -> TaskTemplateService:
+    """Build the task template service once per request for the route to use."""
+    return TaskTemplateService(db)
+
+
+def get_task_execution_service(
+    db: AsyncSession = Depends(get_db_session),
+) -> TaskExecutionService:
+    """Build the task execution service once per request for the route to use."""
+    return TaskExecutionService(db)
+
+
 # Task Template Endpoints
 
 
 @router.post("/templates", response_model=TaskTemplateResponse, status_code=201)
-@handle_service_exceptions
 async def create_task_template(
-    template_data: TaskTemplateCreate, db: AsyncSession = Depends(get_db_session)
+    template_data: TaskTemplateCreate,
+    service: TaskTemplateService = Depends(get_task_template_service),
 ):
     """
     Create a new task template.
@@ -41,64 +87,56 @@ async def create_task_template(
 
     Returns an error if the required file is not found.
     """
-    service = TaskTemplateService(db)
     template = await service.create_template(template_data)
     return template
 
 
 @router.get("/templates/{template_id}", response_model=TaskTemplateResponse)
-@handle_service_exceptions
+@cacheable()
 async def get_task_template(
-    template_id: int = Path(..., description="Task template ID"),
-    db: AsyncSession = Depends(get_db_session),
+    template_id: TemplateIdParam,
+    service: TaskTemplateService = Depends(get_task_template_service),
 ):
     """Get a task template by ID."""
-    service = TaskTemplateService(db)
     return await service.get_template(template_id)
 
 
 @router.put("/templates/{template_id}", response_model=TaskTemplateResponse)
-@handle_service_exceptions
 async def update_task_template(
     template_data: TaskTemplateUpdate,
-    template_id: int = Path(..., description="Task template ID"),
-    db: AsyncSession = Depends(get_db_session),
+    template_id: TemplateIdParam,
+    service: TaskTemplateService = Depends(get_task_template_service),
 ):
     """
     Update a task template.
 
     If updating file_path, the new file must exist in the tasks directory structure.
     """
-    service = TaskTemplateService(db)
     template = await service.update_template(template_id, template_data)
     return template
 
 
 @router.delete("/templates/{template_id}", status_code=204)
-@handle_service_exceptions
 async def delete_task_template(
-    template_id: int = Path(..., description="Task template ID"),
-    db: AsyncSession = Depends(get_db_session),
+    template_id: TemplateIdParam,
+    service: TaskTemplateService = Depends(get_task_template_service),
 ):
     """
     Delete a task template.
 
     Note: This will also delete all associated task executions.
     """
-    service = TaskTemplateService(db)
     await service.delete_template(template_id)
 
 
 @router.get("/templates", response_model=TaskTemplateListResponse)
-@handle_service_exceptions
+@cacheable()
 async def list_task_templates(
     project_name: Optional[str] = Query(None, description="Filter by project name"),
-    skip: int = Query(0, ge=0, description="Number of templates to skip"),
-    limit: int = Query(
-        100, ge=1, le=1000, description="Maximum number of templates to return"
-    ),
-    active_only: bool = Query(True, description="Return only active templates"),
-    db: AsyncSession = Depends(get_db_session),
+    skip: SkipParam = 0,
+    limit: LimitParam = 100,
+    active_only: ActiveOnlyParam = True,
+    service: TaskTemplateService = Depends(get_task_template_service),
 ):
     """
     List task templates.
@@ -106,36 +144,34 @@ async def list_task_templates(
     If project_name is provided, only templates for that project are returned.
     Otherwise, all templates are returned.
     """
-    service = TaskTemplateService(db)
 
     if project_name:
-        return await service.list_templates_by_project(
+        templates = await service.list_templates_by_project(
             project_name, skip=skip, limit=limit, active_only=active_only
         )
     else:
-        return await service.list_all_templates(
+        templates = await service.list_all_templates(
             skip=skip, limit=limit, active_only=active_only
         )
+    return model_response(templates)
 
 
 @router.get(
     "/projects/{project_name}/templates", response_model=TaskTemplateListResponse
 )
-@handle_service_exceptions
+@cacheable()
 async def list_project_task_templates(
     project_name: str = Path(..., description="Project name"),
-    skip: int = Query(0, ge=0, description="Number of templates to skip"),
-    limit: int = Query(
-        100, ge=1, le=1000, description="Maximum number of templates to return"
-    ),
-    active_only: bool = Query(True, description="Return only active templates"),
-    db: AsyncSession = Depends(get_db_session),
+    skip: SkipParam = 0,
+    limit: LimitParam = 100,
+    active_only: ActiveOnlyParam = True,
+    service: TaskTemplateService = Depends(get_task_template_service),
 ):
     """List all task templates for a specific project."""
-    service = TaskTemplateService(db)
-    return await service.list_templates_by_project(
+    templates = await service.list_templates_by_project(
         project_name, skip=skip, limit=limit, active_only=active_only
     )
+    return model_response(templates)
 
 
 # Task Execution Endpoints
@@ -156,24 +192,18 @@ async def execute_task(
         error_message = str(err)  # Capture the error message in the current scope
 
         async def error_generator():
-            yield 'data: {"status": "starting", "message": "🚀 Initializing task execution..."}\n\n'
-            error_msg = f"❌ Execution failed: {error_message}"
-            yield f'data: {{"status": "error", "message": "{error_msg}"}}\n\n'
+            yield _SSE_STARTING
+            yield sse_event("error", f"❌ Execution failed: {error_message}")
 
         return StreamingResponse(
             error_generator(),
             media_type="text/event-stream",
-            headers={
-                "Cache-Control": "no-cache",
-                "Connection": "keep-alive",
-                "Access-Control-Allow-Origin": "*",
-                "Access-Control-Allow-Headers": "*",
-            },
+            headers=_SSE_HEADERS,
         )
 
     async def generate():
         try:
-            yield 'data: {"status": "starting", "message": "🚀 Initializing task execution..."}\n\n'
+            yield _SSE_STARTING
 
             # Create a new service instance for streaming (no session needed)
             async for log_chunk in TaskExecutionService.execute_task_streaming_static(
@@ -181,57 +211,44 @@ async def execute_task(
             ):
                 yield log_chunk
 
-            yield 'data: {"status": "stream_end", "message": "Stream completed"}\n\n'
+            yield _SSE_STREAM_END
             # mark the task as completed
             await service.mark_task_as_completed(task_execution_data)
 
         except Exception as e:
-            error_msg = f"❌ Execution failed: {str(e)}"
-            yield f'data: {{"status": "error", "message": "{error_msg}"}}\n\n'
+            yield sse_event("error", f"❌ Execution failed: {str(e)}")
 
     return StreamingResponse(
         generate(),
         media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "Access-Control-Allow-Origin": "*",
-            "Access-Control-Allow-Headers": "*",
-        },
+        headers=_SSE_HEADERS,
     )
 
 
 @router.get("/executions/{task_id}", response_model=TaskResponse)
-@handle_service_exceptions
 async def get_task_execution(
-    task_id: int = Path(..., description="Task execution ID"),
-    db: AsyncSession = Depends(get_db_session),
+    task_id: TaskIdParam,
+    service: TaskExecutionService = Depends(get_task_execution_service),
 ):
     """Get details of a specific task execution."""
-    service = TaskExecutionService(db)
     return await service.get_task(task_id)
 
 
-@router.get("/projects/{project_name}/executions")
-@handle_service_exceptions
+@router.get("/projects/{project_name}/executions", response_model=TaskExecutionPage)
 async def list_project_task_executions(
     project_name: str = Path(..., description="Project name"),
     workspace_name: Optional[str] = Query(None, description="Workspace name filter"),
-    skip: int = Query(0, ge=0, description="Number of executions to skip"),
-    limit: int = Query(
-        100, ge=1, le=1000, description="Maximum number of executions to return"
-    ),
-    db: AsyncSession = Depends(get_db_session),
+    skip: SkipParam = 0,
+    limit: LimitParam = 100,
+    service: TaskExecutionService = Depends(get_task_execution_service),
 ):
     """List all task executions for a specific project."""
-    service = TaskExecutionService(db)
-    tasks = await service.list_tasks_by_project(
+    tasks, total = await service.list_tasks_by_project_paginated(
         project_name, workspace_name=workspace_name, skip=skip, limit=limit
     )
 
-    return {
-        "tasks": tasks,
-        "total": len(tasks),
-        "skip": skip,
-        "limit": limit,
-    }
+    return json_response(
+        _task_execution_page.dump_json(
+            {"tasks": tasks, "total": total, "skip": skip, "limit": limit}
+        )
+    )
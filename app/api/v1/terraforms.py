@@ -1,12 +1,15 @@
-from pathlib import Path
+import re
+from functools import partial
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
-from fastapi.responses import StreamingResponse
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, Depends, HTTPException, Query
+from starlette.background import BackgroundTask
 
+from app.api.streaming import BytesStreamingResponse
 from app.api.v1.params import ProjectWorkspaceParams
-from app.databases.database import get_db_session
+from app.api.v1.variables import get_variable_service
+from app.databases.database import get_database_manager
 from app.logger import logger
+from app.services.bg_queue import background_queue
 from app.services.inventory_services import InventoryService
 from app.services.terraform_services import (
     build_var_file,
@@ -21,24 +24,66 @@ router = APIRouter(
     prefix="/projects/{project}/workspaces/{workspace}", tags=["Terraform"]
 )
 
+# Keep reverse proxies (e.g. nginx) from buffering the streamed output.
+_STREAM_HEADERS = {"X-Accel-Buffering": "no", "Cache-Control": "no-cache"}
+_STREAMING_OPENAPI = {"x-response-streaming": True}
+
+# Success markers searched in the streamed terraform output, compiled once.
+_APPLY_SUCCESS_RE = re.compile(
+    rb"Apply complete!|Apply successful!|Terraform has completed the apply"
+    rb"|has been successfully applied"
+)
+# "Apply complete!" covers destroying an empty state.
+_DESTROY_SUCCESS_RE = re.compile(
+    rb"Destroy complete!|Apply complete!|Resources:.*destroyed"
+)
+# Bytes of the previous chunk searched together with the next one.
+_SUCCESS_TAIL_BYTES = 64
+
+
+class _SuccessMarker:
+    """
+    Chunk callback recording whether a success marker appeared in the output.
+
+    Output arrives in pipe-sized chunks, so the tail of the previous chunk is
+    kept to find a marker split across two reads. Returns True on the first
+    match so the stream stops scanning the rest of the output.
+    """
+
+    def __init__(self, pattern: re.Pattern[bytes]):
+        self.pattern = pattern
+        self.match: str | None = None
+        self._tail = b""
+
+    def __call__(self, chunk: bytes) -> bool:
+        if self.match is not None:
+            return True
+        if match := self.pattern.search(self._tail + chunk):
+            self.match = match.group(0).decode()
+            return True
+        self._tail = chunk[-_SUCCESS_TAIL_BYTES:]
+        return False
+
+
+def _stream_error(error: RuntimeError) -> bytes:
+    """
+    Error trailer for a failed terraform stream.
+
+    The HTTP status can't change once streaming has started, so the error is
+    appended to the output instead.
+    """
+    return f"\n\nERROR: {error}\n".encode()
+
 
 async def cleanup_inventory_background(project: str, workspace: str):
     """
     Background task to cleanup inventory after successful terraform destroy.
     """
-    import asyncio
-
     try:
-        # Wait a short moment to ensure terraform has fully completed
-        await asyncio.sleep(2)
-
         logger.info(
             f"Starting background inventory cleanup for project: {project}, workspace: {workspace}"
         )
 
-        # Import here to avoid circular imports
-        from app.databases.database import get_database_manager
-
         # Create a new database session for the background task
         db_manager = get_database_manager()
         async with db_manager.get_session() as db:
@@ -63,20 +108,11 @@ async def sync_inventory_background(project: str, workspace: str):
     """
     Background task to sync inventory after successful terraform apply.
     """
-    # TODO: Move this to a proper background task manager
-    import asyncio
-
     try:
-        # Wait a short moment to ensure terraform has fully completed
-        await asyncio.sleep(2)
-
         logger.info(
             f"Starting background inventory sync for project: {project}, workspace: {workspace}"
         )
 
-        # Import here to avoid circular imports
-        from app.databases.database import get_database_manager
-
         # Create a new database session for the background task
         db_manager = get_database_manager()
         async with db_manager.get_session() as db:
@@ -108,6 +144,56 @@ async def sync_inventory_background(project: str, workspace: str):
         )
 
 
+async def sync_inventory_if_applied(
+    success: _SuccessMarker, project: str, workspace: str
+):
+    """
+    Queue the inventory sync if the streamed apply reported success.
+    """
+    if success.match is None:
+        return
+    logger.info(f"Terraform apply completed successfully for {project}/{workspace}")
+    logger.debug(f"Success detected from output: {success.match}")
+    background_queue.submit(partial(sync_inventory_background, project, workspace))
+    logger.info(f"Queued background inventory sync for {project}/{workspace}")
+
+
+async def cleanup_inventory_if_destroyed(
+    success: _SuccessMarker, project: str, workspace: str
+):
+    """
+    Queue the inventory cleanup if the streamed destroy reported success.
+    """
+    if success.match is None:
+        logger.warning(
+            f"Terraform destroy may not have completed successfully for {project}/{workspace}, "
+            "skipping inventory cleanup"
+        )
+        return
+    logger.info(f"Terraform destroy completed successfully for {project}/{workspace}")
+    background_queue.submit(partial(cleanup_inventory_background, project, workspace))
+    logger.info(f"Queued background inventory cleanup for {project}/{workspace}")
+
+
+async def _prepare_var_file(
+    params: ProjectWorkspaceParams, from_db: bool, variable_service: VariableService
+) -> bool:
+    """
+    Build the var file from the database, or check that it exists.
+
+    Returns False if there is no var file to run the command with.
+    """
+    try:
+        if from_db:
+            # If fetching from the database, build the var file
+            await build_var_file(params.project, params.workspace, variable_service)
+        else:
+            await get_var_file(params.project_path, params.workspace)
+    except FileNotFoundError:
+        return False
+    return True
+
+
 @router.post(
     "/plan",
     responses={
@@ -115,26 +201,14 @@ async def sync_inventory_background(project: str, workspace: str):
             "description": "Bad Request: Cannot provide variables and fetch from database at the same time."
         }
     },
+    openapi_extra=_STREAMING_OPENAPI,
 )
 async def plan(
     variables: dict[str, str | int | float | bool] | None = None,
     from_db: bool = Query(True, description="Fetch variables from the database"),
     params: ProjectWorkspaceParams = Depends(),
-    db: AsyncSession = Depends(get_db_session),
+    variable_service: VariableService = Depends(get_variable_service),
 ):
-    # Pre-validate that var file exists if no variables provided
-    if not variables:
-        try:
-            variable_service = VariableService(db)
-            project_path = Path(f"infra/{params.project}/infra/terraform")
-            if from_db:
-                # If fetching from the database, build the var file
-                await build_var_file(params.project, params.workspace, variable_service)
-            else:
-                await get_var_file(project_path, params.workspace)
-        except FileNotFoundError:
-            raise HTTPException(status_code=404, detail="Var file not found")
-
     if variables and from_db:
         raise HTTPException(
             status_code=400,
@@ -142,28 +216,19 @@ async def plan(
             "Please either provide variables or set from_db=False.",
         )
 
-    async def safe_terraform_stream():
-        """
-        Wrapper for terraform streaming that handles RuntimeError exceptions
-        and converts them to proper error responses.
-        """
-        try:
-            async for line in stream_terraform_plan(
-                Path(f"infra/{params.project}/infra/terraform"),
-                params.workspace,
-                vars=variables,
-            ):
-                yield line
-        except RuntimeError as e:
-            # If a RuntimeError occurs during streaming, yield an error message
-            # Since we can't change the HTTP status code once streaming has started,
-            # we'll yield a clear error message
-            error_message = f"\n\nERROR: {str(e)}\n"
-            yield error_message
-
-    return StreamingResponse(
-        safe_terraform_stream(),
+    # Pre-validate that var file exists if no variables provided
+    if not variables and not await _prepare_var_file(params, from_db, variable_service):
+        raise HTTPException(status_code=404, detail="Var file not found")
+
+    return BytesStreamingResponse(
+        stream_terraform_plan(
+            params.project_path,
+            params.workspace,
+            vars=variables,
+            on_error=_stream_error,
+        ),
         media_type="text/plain",
+        headers=_STREAM_HEADERS,
     )
 
 
@@ -174,29 +239,14 @@ async def plan(
             "description": "Bad Request: Cannot provide variables and fetch from database at the same time."
         }
     },
+    openapi_extra=_STREAMING_OPENAPI,
 )
 async def apply(
-    background_tasks: BackgroundTasks,
     variables: dict[str, str | int | float | bool] | None = None,
     from_db: bool = Query(True, description="Fetch variables from the database"),
     params: ProjectWorkspaceParams = Depends(),
-    db: AsyncSession = Depends(get_db_session),
+    variable_service: VariableService = Depends(get_variable_service),
 ):
-    if not variables:
-        try:
-            variable_service = VariableService(db)
-            project_path = Path(f"infra/{params.project}/infra/terraform")
-            if from_db:
-                # If fetching from the database, build the var file
-                await build_var_file(params.project, params.workspace, variable_service)
-            else:
-                await get_var_file(project_path, params.workspace)
-        except FileNotFoundError:
-            raise HTTPException(
-                status_code=404,
-                detail="Var file not found. Perhaps you should go for a /plan first?",
-            )
-
     if variables and from_db:
         raise HTTPException(
             status_code=400,
@@ -204,104 +254,55 @@ async def apply(
             "Please either provide variables or set from_db=False.",
         )
 
-    async def safe_terraform_stream():
-        """
-        Wrapper for terraform streaming that handles RuntimeError exceptions.
-        """
-        apply_successful = False
-        try:
-            async for line in stream_terraform_apply(
-                Path(f"infra/{params.project}/infra/terraform"),
-                params.workspace,
-                vars=variables,
-            ):
-                yield line
-
-                # Check for successful apply completion - multiple possible success indicators
-                if any(
-                    success_phrase in line
-                    for success_phrase in [
-                        "Apply complete!",
-                        "Apply successful!",
-                        "Terraform has completed the apply",
-                        "has been successfully applied",
-                    ]
-                ):
-                    apply_successful = True
-                    logger.info(
-                        f"Terraform apply completed successfully for {params.project}/{params.workspace}"
-                    )
-                    logger.debug(f"Success detected from line: {line.strip()}")
-
-        except RuntimeError as e:
-            error_message = f"\n\nERROR: {str(e)}\n"
-            yield error_message
-
-        # Schedule inventory sync if apply was successful
-        if apply_successful:
-            background_tasks.add_task(
-                sync_inventory_background, params.project, params.workspace
-            )
-            logger.info(
-                f"Scheduled background inventory sync for {params.project}/{params.workspace}"
-            )
+    if not variables and not await _prepare_var_file(params, from_db, variable_service):
+        raise HTTPException(
+            status_code=404,
+            detail="Var file not found. Perhaps you should go for a /plan first?",
+        )
 
-    return StreamingResponse(
-        safe_terraform_stream(),
+    success = _SuccessMarker(_APPLY_SUCCESS_RE)
+    return BytesStreamingResponse(
+        stream_terraform_apply(
+            params.project_path,
+            params.workspace,
+            vars=variables,
+            on_chunk=success,
+            on_error=_stream_error,
+        ),
         media_type="text/plain",
+        headers=_STREAM_HEADERS,
+        # Runs once the response has been streamed, and only queues the work
+        background=BackgroundTask(
+            sync_inventory_if_applied, success, params.project, params.workspace
+        ),
     )
 
 
-@router.post("/destroy")
+@router.post("/destroy", openapi_extra=_STREAMING_OPENAPI)
 async def destroy(
-    background_tasks: BackgroundTasks,
     variables: dict[str, str | int | float | bool] | None = None,
     params: ProjectWorkspaceParams = Depends(),
 ):
-    async def safe_terraform_stream():
-        """
-        Wrapper for terraform streaming that handles RuntimeError exceptions.
-        """
-        destroy_successful = False
-        try:
-            async for line in stream_terraform_destroy(
-                Path(f"infra/{params.project}/infra/terraform"),
-                params.workspace,
-                vars=variables,
-            ):
-                yield line
-                # Check for successful completion indicators
-                if (
-                    "Destroy complete!" in line
-                    or ("Resources:" in line and "destroyed" in line)
-                    or "Apply complete!" in line  # In case of empty state
-                ):
-                    destroy_successful = True
-                    logger.info(
-                        f"Terraform destroy completed successfully for {params.project}/{params.workspace}"
-                    )
-        except RuntimeError as e:
-            error_message = f"\n\nERROR: {str(e)}\n"
-            yield error_message
-            logger.error(
-                f"Terraform destroy failed for {params.project}/{params.workspace}: {str(e)}"
-            )
+    success = _SuccessMarker(_DESTROY_SUCCESS_RE)
 
-        # Schedule inventory cleanup if destroy was successful
-        if destroy_successful:
-            background_tasks.add_task(
-                cleanup_inventory_background, params.project, params.workspace
-            )
-            logger.info(
-                f"Scheduled background inventory cleanup for {params.project}/{params.workspace}"
-            )
-        else:
-            logger.warning(
-                f"Terraform destroy may not have completed successfully for {params.project}/{params.workspace}, "
-                "skipping inventory cleanup"
-            )
-
-    return StreamingResponse(
-        safe_terraform_stream(),
+    def on_error(error: RuntimeError) -> bytes:
+        logger.error(
+            f"Terraform destroy failed for {params.project}/{params.workspace}: {error}"
+        )
+        return _stream_error(error)
+
+    return BytesStreamingResponse(
+        stream_terraform_destroy(
+            params.project_path,
+            params.workspace,
+            vars=variables,
+            on_chunk=success,
+            on_error=on_error,
+        ),
         media_type="text/plain",
+        headers=_STREAM_HEADERS,
+        # Runs once the response has been streamed, and only queues the work
+        background=BackgroundTask(
+            cleanup_inventory_if_destroyed, success, params.project, params.workspace
+        ),
     )
@@ -1,14 +1,22 @@
 """API endpoints for managing variables."""
 
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 
 from fastapi import APIRouter, Depends, Query
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession
-
-from app.api.error_handlers import handle_service_exceptions
-from app.databases.database import get_db_session
+from sqlalchemy.orm import Session
+
+from app.api.responses import json_response, model_response
+from app.api.streaming import BytesStreamingResponse
+from app.databases.database import (
+    get_database_manager,
+    get_db_session,
+    get_tx_session,
+)
 from app.databases.models import VariableType
-from app.logger import logger
 from app.schemas.variable_schema import (
     VariableBulkImportRequest,
     VariableBulkImportResponse,
@@ -22,25 +30,58 @@ from app.schemas.variable_schema import (
     VariableUpdate,
     VariableValidationResponse,
 )
-from app.services.variable_services import VariableService
+from app.services.variable_services import (
+    VariableService,
+    invalidate_deployment_variables,
+)
 
 router = APIRouter(
     prefix="/variables",
     tags=["Variables"],
+    default_response_class=ORJSONResponse,
 )
 
+# List endpoints serialize their already-typed results straight to JSON bytes
+# and return a Response, so FastAPI skips re-validating every row against the
+# response_model (which is still declared for the OpenAPI schema).
+_variable_list = TypeAdapter(list[VariableResponse])
+_variable = TypeAdapter(VariableResponse)
+
+
+def get_variable_service(db: AsyncSession = Depends(get_db_session)) -> VariableService:
+    """Build the variable service once per request for the route to use."""
+    return VariableService(db)
+
+
+def _invalidate_on_commit(session: Session) -> None:
+    invalidate_deployment_variables()
+
+
+def get_tx_variable_service(
+    db: AsyncSession = Depends(get_tx_session),
+) -> VariableService:
+    """
+    Build the variable service on a transactional session for mutating routes.
+
+    Variables may change, so the deployment variables cache is cleared once
+    the transaction has committed. Clearing it any earlier (e.g. when the
+    route returns) would let a concurrent read cache the pre-commit rows
+    again for the whole TTL.
+    """
+    event.listen(db.sync_session, "after_commit", _invalidate_on_commit)
+    return VariableService(db)
+
 
 @router.get("/statistics", response_model=VariableStatisticsResponse)
-@handle_service_exceptions
-async def get_variable_statistics(db: AsyncSession = Depends(get_db_session)):
+async def get_variable_statistics(
+    service: VariableService = Depends(get_variable_service),
+):
     """Get statistics about variables across all projects and workspaces."""
-    service = VariableService(db)
     stats = await service.get_variable_statistics()
     return stats
 
 
 @router.get("/search", response_model=List[VariableResponse])
-@handle_service_exceptions
 async def search_variables(
     q: str = Query(..., description="Search term"),
     project_name: Optional[str] = Query(None, description="Filter by project name"),
@@ -50,77 +91,58 @@ async def search_variables(
     ),
     skip: int = Query(0, ge=0, description="Number of variables to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Number of variables to return"),
-    db: AsyncSession = Depends(get_db_session),
+    service: VariableService = Depends(get_variable_service),
 ):
     """Search variables by key or description."""
-    service = VariableService(db)
     variables = await service.search_variables(
         q, project_name, workspace_name, variable_type, skip, limit
     )
-    return variables
+    return json_response(
+        _variable_list.dump_json([VariableResponse.from_row(var) for var in variables])
+    )
 
 
 @router.post("/", response_model=VariableResponse)
-@handle_service_exceptions
 async def create_variable(
-    variable_data: VariableCreate, db: AsyncSession = Depends(get_db_session)
+    variable_data: VariableCreate,
+    service: VariableService = Depends(get_tx_variable_service),
 ):
     """Create a new variable."""
-    try:
-        service = VariableService(db)
-        variable = await service.create_variable(variable_data)
-        await db.commit()  # Commit the transaction
-        return variable
-    except Exception as e:
-        await db.rollback()
-        logger.error(f"Failed to create variable: {e}")
-        raise e
+    variable = await service.create_variable(variable_data)
+    return variable
 
 
 @router.get("/{variable_id}", response_model=VariableResponse)
-@handle_service_exceptions
-async def get_variable(variable_id: int, db: AsyncSession = Depends(get_db_session)):
+async def get_variable(
+    variable_id: int, service: VariableService = Depends(get_variable_service)
+):
     """Get a variable by ID."""
-    service = VariableService(db)
     variable = await service.get_variable(variable_id)
     return variable
 
 
 @router.put("/{variable_id}", response_model=VariableResponse)
-@handle_service_exceptions
 async def update_variable(
     variable_id: int,
     variable_data: VariableUpdate,
-    db: AsyncSession = Depends(get_db_session),
+    service: VariableService = Depends(get_tx_variable_service),
 ):
     """Update a variable."""
-    try:
-        service = VariableService(db)
-        variable = await service.update_variable(variable_id, variable_data)
-        return variable
-    except Exception as e:
-        await db.rollback()
-        logger.error(f"Failed to update variable ID {variable_id}: {e}")
-        raise
+    variable = await service.update_variable(variable_id, variable_data)
+    return variable
 
 
 @router.delete("/{variable_id}", status_code=204)
-@handle_service_exceptions
-async def delete_variable(variable_id: int, db: AsyncSession = Depends(get_db_session)):
+async def delete_variable(
+    variable_id: int, service: VariableService = Depends(get_tx_variable_service)
+):
     """Delete a variable."""
-    try:
-        service = VariableService(db)
-        success = await service.delete_variable(variable_id)
-        if not success:
-            return {"message": "Variable not found"}
-    except Exception as e:
-        await db.rollback()
-        logger.error(f"Failed to delete variable ID {variable_id}: {e}")
-        raise
+    success = await service.delete_variable(variable_id)
+    if not success:
+        return {"message": "Variable not found"}
 
 
 @router.get("/", response_model=VariableListResponse)
-@handle_service_exceptions
 async def list_variables(
     skip: int = Query(0, ge=0, description="Number of variables to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Number of variables to return"),
@@ -131,20 +153,18 @@ async def list_variables(
     variable_type_filter: Optional[VariableType] = Query(
         None, description="Filter by variable type"
     ),
-    db: AsyncSession = Depends(get_db_session),
+    service: VariableService = Depends(get_variable_service),
 ):
     """List all variables with optional filtering."""
-    service = VariableService(db)
-    variables = await service.list_all_variables(
+    variables, total = await service.list_all_variables(
         skip, limit, project_filter, workspace_filter, variable_type_filter
     )
-    # For simplicity, returning the count of retrieved variables.
-    # In production, you might want to count total matching records separately.
-    return VariableListResponse(variables=variables, total=len(variables))
+    return model_response(
+        VariableListResponse.model_construct(variables=variables, total=total)
+    )
 
 
 @router.get("/project/{project_name}", response_model=List[VariableResponse])
-@handle_service_exceptions
 async def get_project_variables(
     project_name: str,
     workspace: str = Query(None, description="Workspace name"),
@@ -153,40 +173,68 @@ async def get_project_variables(
     ),
     skip: int = Query(0, ge=0, description="Number of variables to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Number of variables to return"),
-    db: AsyncSession = Depends(get_db_session),
+    service: VariableService = Depends(get_variable_service),
 ):
     """Get variables for a specific project workspace."""
-    service = VariableService(db)
     variables = await service.get_variables_by_project(
         project_name, workspace, variable_type, skip, limit
     )
-    return variables
+    return json_response(_variable_list.dump_json(variables))
+
+
+@router.get(
+    "/project/{project_name}/stream",
+    response_class=BytesStreamingResponse,
+    responses={
+        200: {
+            "description": "One JSON variable per line",
+            "content": {"application/x-ndjson": {}},
+        }
+    },
+)
+async def stream_project_variables(
+    project_name: str,
+    workspace: str = Query(None, description="Workspace name"),
+    variable_type: VariableType = Query(
+        VariableType.TERRAFORM, description="Filter by variable type"
+    ),
+):
+    """
+    Stream all variables for a project workspace as NDJSON, for exports too
+    large for a single page.
+    """
+
+    # The request-scoped session is closed before the body is streamed, so the
+    # stream opens its own session, held until the last row is sent.
+    async def lines() -> AsyncIterator[bytes]:
+        async with get_database_manager().async_session_maker() as db:
+            service = VariableService(db)
+            async for variable in service.stream_variables_by_project(
+                project_name, workspace, variable_type
+            ):
+                yield _variable.dump_json(variable) + b"\n"
+
+    return BytesStreamingResponse(lines(), media_type="application/x-ndjson")
 
 
 # === Use Case Endpoints ===
 
 
 @router.post("/bulk-import", response_model=VariableBulkImportResponse)
-@handle_service_exceptions
 async def bulk_import_variables(
-    import_data: VariableBulkImportRequest, db: AsyncSession = Depends(get_db_session)
+    import_data: VariableBulkImportRequest,
+    service: VariableService = Depends(get_tx_variable_service),
 ):
     """Bulk import variables with conflict resolution."""
-    try:
-        service = VariableService(db)
-        result = await service.bulk_import_variables(
-            import_data.variables, import_data.overwrite_existing
-        )
-        await db.commit()  # Commit the transaction
-        return result
-    except Exception as e:
-        await db.rollback()
-        logger.error(f"Failed to bulk import variables: {e}")
-        raise
+    result = await service.bulk_import_variables(
+        import_data.variables, import_data.overwrite_existing
+    )
+    return model_response(
+        VariableBulkImportResponse.model_validate(result, from_attributes=True)
+    )
 
 
 @router.post("/clone")
-@handle_service_exceptions
 async def clone_workspace_variables(
     source_project: str = Query(..., description="Source project name"),
     source_workspace: str = Query(..., description="Source workspace name"),
@@ -196,86 +244,71 @@ async def clone_workspace_variables(
         VariableType.TERRAFORM, description="Variable type to clone"
     ),
     overwrite_existing: bool = Query(False, description="Overwrite existing variables"),
-    db: AsyncSession = Depends(get_db_session),
+    service: VariableService = Depends(get_tx_variable_service),
 ):
     """Clone variables from one workspace to another."""
-    try:
-        service = VariableService(db)
-        result = await service.clone_workspace_variables(
-            source_project,
-            source_workspace,
-            target_project,
-            target_workspace,
-            variable_type,
-            overwrite_existing,
-        )
-        await db.commit()  # Commit the transaction
-        return result
-    except Exception as e:
-        await db.rollback()
-        logger.error(f"Failed to clone workspace variables: {e}")
-        raise
+    result = await service.clone_workspace_variables(
+        source_project,
+        source_workspace,
+        target_project,
+        target_workspace,
+        variable_type,
+        overwrite_existing,
+    )
+    return result
 
 
 @router.delete("/cleanup")
-@handle_service_exceptions
 async def cleanup_workspace_variables(
     project_name: str = Query(..., description="Project name"),
     workspace_name: Optional[str] = Query(None, description="Workspace name"),
-    db: AsyncSession = Depends(get_db_session),
+    service: VariableService = Depends(get_tx_variable_service),
 ):
     """Clean up all variables for a workspace."""
-    try:
-        service = VariableService(db)
-        deleted_count = await service.cleanup_workspace_variables(
-            project_name, workspace_name
-        )
-        await db.commit()  # Commit the transaction
-        return {
-            "message": f"Deleted {deleted_count} variables",
-            "deleted_count": deleted_count,
-        }
-    except Exception as e:
-        await db.rollback()
-        logger.error(f"Failed to clean up workspace variables: {e}")
-        raise
+    deleted_count = await service.cleanup_workspace_variables(
+        project_name, workspace_name
+    )
+    return {
+        "message": f"Deleted {deleted_count} variables",
+        "deleted_count": deleted_count,
+    }
 
 
 @router.get("/export/terraform", response_model=VariableExportResponse)
-@handle_service_exceptions
 async def export_variables_terraform(
     project_name: str = Query(..., description="Project name"),
     workspace_name: Optional[str] = Query(None, description="Workspace name"),
     include_sensitive: bool = Query(False, description="Include sensitive variables"),
-    db: AsyncSession = Depends(get_db_session),
+    service: VariableService = Depends(get_variable_service),
 ):
     """Export variables in Terraform-compatible format."""
-    service = VariableService(db)
     result = await service.export_variables_to_terraform_format(
         project_name, workspace_name, include_sensitive
     )
-    return result
+    # The values are passed through as stored: they are serialized once,
+    # without a validation pass over every variable's value first
+    return model_response(VariableExportResponse.model_construct(**result))
 
 
 @router.get("/validate", response_model=VariableValidationResponse)
-@handle_service_exceptions
 async def validate_variables(
     project_name: str = Query(..., description="Project name"),
     workspace_name: Optional[str] = Query(None, description="Workspace name"),
     required_variables: Optional[str] = Query(
-        None, description="Comma-separated list of required variable names"
+        None,
+        max_length=4096,
+        description="Comma-separated list of required variable names",
     ),
-    db: AsyncSession = Depends(get_db_session),
+    service: VariableService = Depends(get_variable_service),
 ):
     """Validate that all required variables are defined."""
-    service = VariableService(db)
 
-    # Parse required variables from comma-separated string
-    required_vars = []
-    if required_variables:
-        required_vars = [
-            var.strip() for var in required_variables.split(",") if var.strip()
-        ]
+    # Parse required variables from comma-separated string, dropping blanks
+    required_vars = (
+        tuple(filter(None, map(str.strip, required_variables.split(","))))
+        if required_variables
+        else ()
+    )
 
     result = await service.validate_variable_references(
         project_name, workspace_name, required_vars
@@ -284,9 +317,9 @@ async def validate_variables(
 
 
 @router.post("/import-shell", response_model=VariableShellImportResponse)
-@handle_service_exceptions
 async def import_variables_from_shell(
-    import_data: VariableShellImportRequest, db: AsyncSession = Depends(get_db_session)
+    import_data: VariableShellImportRequest,
+    service: VariableService = Depends(get_tx_variable_service),
 ):
     """
     Import variables from shell script content.
@@ -301,19 +334,12 @@ async def import_variables_from_shell(
     - **comment_description**: Default description for variables without comments
     - **overwrite_existing**: Whether to overwrite existing variables
     """
-    try:
-        service = VariableService(db)
-        result = await service.import_variables_from_shell_script(
-            shell_content=import_data.shell_content,
-            project_name=import_data.project_name,
-            variable_type=import_data.variable_type,
-            workspace_name=import_data.workspace_name,
-            comment_description=import_data.comment_description,
-            overwrite_existing=import_data.overwrite_existing,
-        )
-        await db.commit()  # Commit the transaction
-        return result
-    except Exception as e:
-        await db.rollback()
-        logger.error(f"Failed to import variables from shell script: {e}")
-        raise
+    result = await service.import_variables_from_shell_script(
+        shell_content=import_data.shell_content,
+        project_name=import_data.project_name,
+        variable_type=import_data.variable_type,
+        workspace_name=import_data.workspace_name,
+        comment_description=import_data.comment_description,
+        overwrite_existing=import_data.overwrite_existing,
+    )
+    return result
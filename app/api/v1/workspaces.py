@@ -1,9 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, Path
-from sqlalchemy.ext.asyncio import AsyncSession
+import io
+from itertools import groupby
+from typing import Any, AsyncIterator, Iterable, Iterator, Literal
 
+from fastapi import APIRouter, Depends, HTTPException, Path, Query
+from fastapi.responses import ORJSONResponse
+
+from app.api.streaming import BytesStreamingResponse
 from app.api.v1.params import ProjectParams, ProjectWorkspaceParams
-from app.databases.database import get_db_session
-from app.databases.models import VariableType
+from app.databases.database import get_database_manager
 from app.exceptions.exceptions import TerraformNotInitializedError
 from app.schemas import WorkspaceCreateInput, WorkspaceListResponse, WorkspaceOutput
 from app.schemas.workspace_schema import DeploymentVarsResponse
@@ -13,11 +17,17 @@ from app.var_type import TFVars
 
 router = APIRouter(prefix="/projects/{project}/workspaces", tags=["Workspaces"])
 
+# Workspace listings and outputs are built by the services from terraform
+# output, so they are created with model_construct and their routes declare
+# the model under `responses` (for the OpenAPI schema) instead of
+# `response_model`, which would validate them again on the way out.
+
 
 @router.get(
     "/",
-    response_model=WorkspaceListResponse,
+    response_model=None,
     responses={
+        200: {"model": WorkspaceListResponse},
         404: {},
         400: {},
         409: {"description": "Conflict: workspace not initialized"},
@@ -48,10 +58,15 @@ async def get_workspaces(
             detail=str(err),
         ) from err
     workspaces = await workspace_services.get_workspaces(params.project)
-    return WorkspaceListResponse(workspaces=workspaces)
+    return WorkspaceListResponse.model_construct(workspaces=workspaces)
 
 
-@router.post("/", response_model=WorkspaceOutput, status_code=201, responses={404: {}})
+@router.post(
+    "/",
+    response_model=None,
+    status_code=201,
+    responses={201: {"model": WorkspaceOutput}, 404: {}},
+)
 async def create_workspace(
     workspace: WorkspaceCreateInput,
     params: ProjectParams = Depends(),
@@ -72,9 +87,9 @@ async def create_workspace(
 
 @router.post(
     "/{workspace}/activate",
-    response_model=WorkspaceOutput,
+    response_model=None,
     status_code=200,
-    responses={404: {}},
+    responses={200: {"model": WorkspaceOutput}, 404: {}},
 )
 async def activate_workspace(
     params: ProjectWorkspaceParams = Depends(),
@@ -226,17 +241,25 @@ async def update_workspace_tfvars(
 @router.get(
     "/{workspace}/deployment-vars",
     response_model=DeploymentVarsResponse,
-    responses={404: {"description": "Workspace not found"}},
+    responses={
+        200: {"content": {"text/x-shellscript": {}}},
+        404: {"description": "Workspace not found"},
+    },
 )
 async def get_deployment_vars(
     params: ProjectWorkspaceParams = Depends(),
     with_shebang: bool = True,
-    db: AsyncSession = Depends(get_db_session),
+    output_format: Literal["json", "shell"] = Query(
+        "json",
+        alias="format",
+        description="Wrap the script in JSON, or return the script itself",
+    ),
 ):
     """
     Get deployment variables in shell script format.
     Returns variables with variable_type in ['PROJECT','INSTANCE'] formatted as bash export statements.
     Variables are grouped by their description field which serves as comment sections.
+    With `format=shell` the script is returned as is, as `text/x-shellscript`.
     """
     try:
         await workspace_services.check_workspace_exists(
@@ -248,51 +271,59 @@ async def get_deployment_vars(
             detail=str(err),
         ) from err
 
-    # Fetch variables from database
-    variable_service = VariableService(db)
-
-    # Get PROJECT variables (shared across all instances)
-    project_variables = await variable_service.get_variables_by_project(
-        project_name=params.project,
-        workspace_name=None,  # PROJECT variables don't have workspace_name
-        variable_type=VariableType.PROJECT,
-        limit=1000,  # Get all variables
-    )
-
-    # Get INSTANCE variables (specific to this workspace)
-    instance_variables = await variable_service.get_variables_by_project(
-        project_name=params.project,
-        workspace_name=params.workspace,
-        variable_type=VariableType.INSTANCE,
-        limit=1000,  # Get all variables
-    )
+    # Fetch the PROJECT variables (shared across all instances) and the
+    # INSTANCE variables of this workspace from the database in one query.
+    # The session is opened only for the query, so its connection goes back
+    # to the pool before the script is built and sent.
+    async with get_database_manager().async_session_maker() as db:
+        variable_service = VariableService(db)
+        all_variables = await variable_service.get_deployment_variables(
+            params.project, params.workspace
+        )
 
-    # Combine all variables
-    all_variables = project_variables + instance_variables
+    if output_format == "shell":
+        # Each group is sent as soon as it is formatted, so the whole script
+        # is never held in memory as one string
+        return BytesStreamingResponse(
+            _encode_chunks(_deployment_script(all_variables, with_shebang)),
+            media_type="text/x-shellscript",
+        )
+    # The script is already a plain str, so encode it with orjson directly
+    # rather than validating it back through DeploymentVarsResponse.
+    content = "".join(_deployment_script(all_variables, with_shebang))
+    return ORJSONResponse({"content": content})
 
-    # Build the shell script content
-    script_lines = ["#!/bin/bash" if with_shebang else ""]
 
-    # Group variables by their description (comment field)
-    grouped_vars = {}  # type: ignore
-    for var in all_variables:
-        comment = var.description or "Variables"
-        if comment not in grouped_vars:
-            grouped_vars[comment] = []
-        grouped_vars[comment].append(var)
+def _deployment_script(variables: Iterable[Any], with_shebang: bool) -> Iterator[str]:
+    """
+    Yield the deployment shell script, one chunk per group of variables.
 
-    # Add variables grouped by comments
-    for comment, vars_in_group in grouped_vars.items():
-        script_lines.append(f"# {comment}")
+    Variables come ordered by description (comment field), so each group is a
+    run of consecutive variables with a single header, PROJECT variables before
+    INSTANCE ones; groups are separated by an empty line.
+    """
+    if with_shebang:
+        yield "#!/bin/bash"
+    for comment, vars_in_group in groupby(variables, key=lambda var: var.description):
+        buf = io.StringIO()
+        buf.write("\n# ")
+        buf.write(comment)
         for var in vars_in_group:
+            buf.write("\nexport ")
+            buf.write(var.key)
+            buf.write("=")
             # Handle different value types
             if isinstance(var.value, str):
-                value = f'"{var.value}"'
+                buf.write('"')
+                buf.write(var.value)
+                buf.write('"')
             else:
-                value = str(var.value)
-            script_lines.append(f"export {var.key}={value}")
-        script_lines.append("")  # Empty line between groups
+                buf.write(str(var.value))
+        buf.write("\n")
+        yield buf.getvalue()
 
-    content = "\n".join(script_lines)
 
-    return DeploymentVarsResponse(content=content)
+async def _encode_chunks(chunks: Iterable[str]) -> AsyncIterator[bytes]:
+    """Encode the chunks of a script to UTF-8 for BytesStreamingResponse."""
+    for chunk in chunks:
+        yield chunk.encode()
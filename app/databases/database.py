@@ -3,9 +3,9 @@
 import os
 from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import AsyncGenerator, Optional
+from typing import Any, AsyncGenerator, Optional
 
-from sqlalchemy import DateTime, func
+from sqlalchemy import DateTime, func, make_url
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
@@ -24,16 +24,75 @@ class Base(DeclarativeBase):
     )
 
 
-class DatabaseManager:
-    """Database manager for handling connections and sessions."""
+# Seconds after which a pooled connection is replaced on its next checkout.
+POOL_RECYCLE = 180
+# Seconds to wait when opening a new connection.
+CONNECT_TIMEOUT = 5
+# Seconds of idleness before the server starts TCP keepalive probes.
+TCP_KEEPALIVES_IDLE = 30
+# Prepared statements kept per connection, so repeated queries skip PARSE.
+STATEMENT_CACHE_SIZE = 256
+
+
+def _connect_args(database_url: str) -> dict[str, Any]:
+    """Driver connection arguments; only asyncpg gets these settings."""
+    if make_url(database_url).get_driver_name() != "asyncpg":
+        return {}
+    return {
+        "timeout": CONNECT_TIMEOUT,
+        "prepared_statement_cache_size": STATEMENT_CACHE_SIZE,
+        "statement_cache_size": STATEMENT_CACHE_SIZE,
+        "server_settings": {"tcp_keepalives_idle": str(TCP_KEEPALIVES_IDLE)},
+    }
 
-    def __init__(self, database_url: str):
+
+class DatabaseManager:
+    """Database manager for handling connections and sessions.
+
+    Connection pool tuning, each overridable by an environment variable:
+    - `DB_POOL_SIZE` (default 20): connections kept open in the pool.
+    - `DB_MAX_OVERFLOW` (default 10): extra connections opened under load.
+    - `DB_POOL_TIMEOUT` (default 30): seconds to wait for a free connection.
+    Each worker process has its own pool, so `(DB_POOL_SIZE + DB_MAX_OVERFLOW)`
+    times the number of workers must stay below the server's max_connections.
+    The pool hands out the most recently used connection first (LIFO), so
+    a few hot connections serve most requests and idle ones can expire.
+    Connections are not pinged on checkout; they are recycled after
+    `POOL_RECYCLE` seconds and, with asyncpg, kept alive by TCP keepalives.
+    """
+
+    def __init__(
+        self,
+        database_url: str,
+        pool_size: int | None = None,
+        max_overflow: int | None = None,
+        pool_timeout: float | None = None,
+    ):
         self.database_url = database_url
         self.engine = create_async_engine(
             database_url,
             echo=False,  # Set to True for SQL logging in development
-            pool_pre_ping=True,
-            pool_recycle=300,
+            pool_size=(
+                pool_size
+                if pool_size is not None
+                else int(os.getenv("DB_POOL_SIZE", "20"))
+            ),
+            max_overflow=(
+                max_overflow
+                if max_overflow is not None
+                else int(os.getenv("DB_MAX_OVERFLOW", "10"))
+            ),
+            pool_timeout=(
+                pool_timeout
+                if pool_timeout is not None
+                else float(os.getenv("DB_POOL_TIMEOUT", "30"))
+            ),
+            pool_use_lifo=True,
+            # Recycling connections and TCP keepalives replace the
+            # per-checkout liveness ping
+            pool_pre_ping=False,
+            pool_recycle=POOL_RECYCLE,
+            connect_args=_connect_args(database_url),
         )
         self.async_session_maker = async_sessionmaker(
             bind=self.engine,
@@ -50,7 +109,7 @@ class DatabaseManager:
                 await session.commit()
             except Exception as e:
                 await session.rollback()
-                logger.error(f"Database session error: {e}")
+                logger.error("Database session error: %s", e)
                 raise
             finally:
                 await session.close()
@@ -89,6 +148,18 @@ async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
+async def get_tx_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    FastAPI dependency to get a database session wrapped in a transaction.
+
+    The transaction commits when the route returns and rolls back if it
+    raises, so routes using it must not commit or roll back themselves.
+    """
+    db = get_database_manager()
+    async with db.async_session_maker() as session, session.begin():
+        yield session
+
+
 def init_database(database_url: str) -> DatabaseManager:
     """Initialize the global database manager."""
     global db_manager
@@ -5,6 +5,7 @@ from datetime import datetime
 from typing import Any
 
 from sqlalchemy import (
+    DDL,
     JSON,
     Boolean,
     Column,
@@ -16,7 +17,10 @@ from sqlalchemy import (
     String,
     Table,
     Text,
+    event,
+    text,
 )
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
@@ -55,6 +59,14 @@ class SSHKeyType(enum.Enum):
     RSA = "rsa"
 
 
+# The trigram indexes on variables need the pg_trgm extension
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+
 # Association table for many-to-many relationship between Inventory and IPAddress
 inventory_ip_association = Table(
     "inventory_ip_association",
@@ -103,6 +115,13 @@ class SSHKeyPair(Base):
         Index("ix_ssh_key_name_project", "name", "project_name", unique=True),
         Index("ix_ssh_key_fingerprint", "fingerprint"),
         Index("ix_ssh_key_project_active", "project_name", "is_active"),
+        # Partial index for the default active_only listing, ordered like the query
+        Index(
+            "ix_ssh_key_project_active_only",
+            "project_name",
+            "created_at",
+            postgresql_where=text("is_active"),
+        ),
     )
 
 
@@ -118,7 +137,8 @@ class Variable(Base):
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     key: Mapped[str] = mapped_column(String(255), index=True)
-    value: Mapped[Any] = mapped_column(JSON)
+    # Stored as binary JSONB on PostgreSQL
+    value: Mapped[Any] = mapped_column(JSON().with_variant(JSONB(), "postgresql"))
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
     variable_type: Mapped[VariableType] = mapped_column(
         Enum(VariableType), default=VariableType.TERRAFORM, nullable=False
@@ -131,6 +151,26 @@ class Variable(Base):
         String(255), nullable=True, index=True
     )
 
+    # Indexes matching the project/workspace/type filters of variable lookups
+    __table_args__ = (
+        Index("ix_var_proj_ws_type", "project_name", "workspace_name", "variable_type"),
+        Index("ix_var_proj_type", "project_name", "variable_type"),
+        Index("ix_variables_value_gin", "value", postgresql_using="gin"),
+        # Trigram indexes serving the ILIKE '%term%' variable search
+        Index(
+            "ix_variable_key_trgm",
+            "key",
+            postgresql_using="gin",
+            postgresql_ops={"key": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_variable_description_trgm",
+            "description",
+            postgresql_using="gin",
+            postgresql_ops={"description": "gin_trgm_ops"},
+        ),
+    )
+
 
 class Inventory(Base):
     """Model for storing VM inventory information, generally from Terraform outputs."""
@@ -174,7 +214,8 @@ class IPAddress(Base):
     __tablename__ = "ip_addresses"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
-    ip: Mapped[str] = mapped_column(String(45), index=True)  # IPv4 or IPv6
+    # IPv4 or IPv6, unique so that IPs can be upserted
+    ip: Mapped[str] = mapped_column(String(45), index=True, unique=True)
     description: Mapped[str | None] = mapped_column(
         Text, nullable=True
     )  # Optional description of the IP address
@@ -244,6 +285,13 @@ class TaskTemplate(Base):
     __table_args__ = (
         Index("ix_task_template_name_project", "name", "project_name", unique=True),
         Index("ix_task_template_type", "template_type"),
+        # Partial index for the default active_only listing, ordered like the query
+        Index(
+            "ix_task_template_project_active_only",
+            "project_name",
+            "created_at",
+            postgresql_where=text("is_active"),
+        ),
     )
 
 
@@ -65,5 +65,10 @@ class TerraformNotInitializedError(ServiceError):
 class TerraformInitError(ServiceError):
     """Exception raised when Terraform initialization fails."""
 
+    remediation = (
+        " Use the reconfigure, upgrade, or migrate_state options to fix the issue."
+        " If not sure, please contact the administrator to check the log message."
+    )
+
     def __init__(self, message: str = "Terraform initialization failed."):
-        super().__init__(message, status_code=500)
+        super().__init__(message + self.remediation, status_code=400)
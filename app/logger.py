@@ -1,11 +1,41 @@
+import atexit
 import logging
+import os
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
 
-logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)  # Set the log level to the highest level to capture
+DEFAULT_LOG_LEVEL = "DEBUG"
 
-# Add a handler if there isn't one already
-if not logger.hasHandlers():
+
+def _log_level(name: str) -> int | None:
+    """The logging level called `name`, in any case, or None if there is none."""
+    return logging.getLevelNamesMapping().get(name.upper())
+
+
+logger = logging.getLogger("app")
+# Capture everything by default; LOG_LEVEL (e.g. INFO) drops the more verbose
+# records before they are built and queued. An unknown level falls back to the
+# default instead of stopping the app at import time.
+log_level_name = os.getenv("LOG_LEVEL", DEFAULT_LOG_LEVEL)
+log_level = _log_level(log_level_name)
+logger.setLevel(log_level if log_level is not None else DEFAULT_LOG_LEVEL)
+# Records are emitted by the handler below only, not again by the root logger
+logger.propagate = False
+
+# Add a handler if there isn't one already. Records are put on a queue and
+# written to the stream by a listener thread, so logging from a coroutine
+# never blocks the event loop on I/O.
+if not logger.handlers:
     handler = logging.StreamHandler()
     formatter = logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
     handler.setFormatter(formatter)
-    logger.addHandler(handler)
+    log_queue: SimpleQueue[logging.LogRecord] = SimpleQueue()
+    listener = QueueListener(log_queue, handler)
+    listener.start()
+    atexit.register(listener.stop)
+    logger.addHandler(QueueHandler(log_queue))
+
+if log_level is None:
+    logger.warning(
+        "Unknown LOG_LEVEL %r, using %s instead", log_level_name, DEFAULT_LOG_LEVEL
+    )
@@ -1,10 +1,13 @@
 import os
 from contextlib import asynccontextmanager
+from pathlib import Path
 from typing import cast
 
 import fastapi
+from fastapi.responses import ORJSONResponse
 # import fastapi_swagger_dark as fsd  # type: ignore
 
+from app.api.error_handlers import register_exception_handlers
 from app.api.v1 import (
     inventory,
     projects,
@@ -16,6 +19,8 @@ from app.api.v1 import (
 )
 from app.databases.database import get_database_manager, init_database
 from app.logger import logger
+from app.services.bg_queue import background_queue
+from app.services.terraform_services import configure_plugin_cache
 
 stage = os.getenv("STAGE", "dev")
 
@@ -38,6 +43,9 @@ async def lifespan(app: fastapi.FastAPI):
         #     await db_manager.create_tables()
         #     logger.info("Database tables created")
 
+        configure_plugin_cache(Path.home() / ".terraform.d" / "plugin-cache")
+        await background_queue.start()
+
         yield
 
     except Exception as e:
@@ -45,6 +53,11 @@ async def lifespan(app: fastapi.FastAPI):
         raise
     finally:
         # Shutdown
+        try:
+            await background_queue.stop()
+        # A failed queue shutdown must not keep the database connections open
+        except Exception as e:  # noqa: BLE001
+            logger.error(f"Error stopping background queue: {e}")
         try:
             db_manager = get_database_manager()
             await db_manager.close()
@@ -72,6 +85,7 @@ It includes listing projects, initializing them, and retrieving details.""",
     debug=stage == "dev",
     root_path_in_servers=False,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     openapi_tags=[
         {
             "name": "Projects",
@@ -117,6 +131,7 @@ It includes listing projects, initializing them, and retrieving details.""",
 
 # TERRAFORM_DIR = "./infra/terraform"
 
+register_exception_handlers(app)
 
 app.include_router(projects.router, prefix="/api/v1")
 app.include_router(workspaces.router, prefix="/api/v1")
@@ -1,17 +1,65 @@
 """Base repository pattern for database operations."""
 
+import os
 from abc import ABC
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from functools import cache
+from typing import (
+    Any,
+    Dict,
+    Generic,
+    List,
+    Optional,
+    Sequence,
+    Type,
+    TypeVar,
+    Union,
+)
 
 from pydantic import BaseModel
-from sqlalchemy import delete, func, select, update
+from sqlalchemy import (
+    ARRAY,
+    Integer,
+    Select,
+    any_,
+    bindparam,
+    delete,
+    func,
+    lambda_stmt,
+    literal,
+    select,
+    text,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute, raiseload
+from sqlalchemy.orm.interfaces import ORMOption
 
 from app.databases.database import Base
 
 ModelType = TypeVar("ModelType", bound=Base)
 SchemaType = TypeVar("SchemaType", bound=BaseModel)
 
+# With RAISE_ON_LAZY_LOAD=1 (e.g. in dev or tests), relationships a query did
+# not eager load raise on access instead of attempting a lazy load, so hidden
+# N+1 queries surface. It is off unless set, so production never raises
+RAISE_ON_LAZY_LOAD = os.getenv("RAISE_ON_LAZY_LOAD") == "1"
+
+# Row count above which unfiltered counts use the planner's estimate
+COUNT_ESTIMATE_THRESHOLD = 10_000
+
+
+def maybe_raiseload() -> tuple[ORMOption, ...]:
+    """Loader options to add to eager-loading queries: `raiseload("*")` when opted in."""
+    return (raiseload("*"),) if RAISE_ON_LAZY_LOAD else ()
+
+
+@cache
+def _column_map(model: Type[Base]) -> Dict[str, InstrumentedAttribute[Any]]:
+    """Map each column attribute name of a model to its attribute, once per model."""
+    return {
+        attr.key: getattr(model, attr.key) for attr in model.__mapper__.column_attrs
+    }
+
 
 class BaseRepository(Generic[ModelType], ABC):
     """Base repository class with common CRUD operations."""
@@ -19,6 +67,7 @@ class BaseRepository(Generic[ModelType], ABC):
     def __init__(self, model: Type[ModelType], session: AsyncSession):
         self.model = model
         self.session = session
+        self._cols = _column_map(model)
 
     async def create(self, **kwargs) -> ModelType:
         """Create a new record."""
@@ -32,11 +81,13 @@ class BaseRepository(Generic[ModelType], ABC):
         return await self.create(**schema.model_dump())
 
     async def get_by_id(self, id: int) -> Optional[ModelType]:
-        """Get a record by ID."""
-        result = await self.session.execute(
-            select(self.model).where(self.model.id == id)  # type: ignore
-        )
-        return result.scalar_one_or_none()
+        """
+        Get a record by ID.
+
+        A record already loaded in the session is returned from the identity
+        map without a query.
+        """
+        return await self.session.get(self.model, id)
 
     async def get_all(
         self,
@@ -46,18 +97,14 @@ class BaseRepository(Generic[ModelType], ABC):
         **filters: Any,
     ) -> List[ModelType]:
         """Get all records with optional filtering, pagination."""
-        query = select(self.model)
-
-        # Apply filters
-        for key, value in filters.items():
-            if hasattr(self.model, key) and value is not None:
-                query = query.where(getattr(self.model, key) == value)
+        query = self._apply_filters(select(self.model), filters)
 
         # Apply ordering
-        if order_by and hasattr(self.model, order_by):
-            query = query.order_by(getattr(self.model, order_by).desc())
-        elif hasattr(self.model, "created_at"):
-            query = query.order_by(getattr(self.model, "created_at").desc())
+        order_col = self._cols.get(order_by) if order_by else None
+        if order_col is None:
+            order_col = self._cols.get("created_at")
+        if order_col is not None:
+            query = query.order_by(order_col.desc())
 
         # Apply pagination
         if skip:
@@ -69,9 +116,15 @@ class BaseRepository(Generic[ModelType], ABC):
         return list(result.scalars().all())
 
     async def get_by_filters(self, **filters: Any) -> Optional[ModelType]:
-        """Get a single record by filters."""
-        results = await self.get_all(limit=1, **filters)
-        return results[0] if results else None
+        """
+        Get a single record by filters.
+
+        Meant for lookups by a unique key, so the query is not ordered: when
+        several records match, any one of them is returned.
+        """
+        query = self._apply_filters(select(self.model), filters).limit(1)
+        result = await self.session.execute(query)
+        return result.scalars().first()
 
     async def get_by_name_and_project(
         self, name: str, project_name: Optional[str] = None
@@ -80,7 +133,7 @@ class BaseRepository(Generic[ModelType], ABC):
         Get a record by name and project - common pattern across many models.
         Override in subclasses if the model doesn't have these fields.
         """
-        if hasattr(self.model, "name") and hasattr(self.model, "project_name"):
+        if "name" in self._cols and "project_name" in self._cols:
             return await self.get_by_filters(name=name, project_name=project_name)
         raise NotImplementedError(
             f"{self.model.__name__} doesn't support get_by_name_and_project"
@@ -98,7 +151,7 @@ class BaseRepository(Generic[ModelType], ABC):
         List records by project - common pattern across many models.
         Override in subclasses if the model doesn't have project_name field.
         """
-        if not hasattr(self.model, "project_name"):
+        if "project_name" not in self._cols:
             raise NotImplementedError(
                 f"{self.model.__name__} doesn't support list_by_project"
             )
@@ -106,7 +159,7 @@ class BaseRepository(Generic[ModelType], ABC):
         filters = {**additional_filters}
         if project_name:
             filters["project_name"] = project_name
-        if active_only and hasattr(self.model, "is_active"):
+        if active_only and "is_active" in self._cols:
             filters["is_active"] = True
 
         return await self.get_all(skip=skip, limit=limit, **filters)
@@ -120,7 +173,7 @@ class BaseRepository(Generic[ModelType], ABC):
         """
         Count records by project - common pattern across many models.
         """
-        if not hasattr(self.model, "project_name"):
+        if "project_name" not in self._cols:
             raise NotImplementedError(
                 f"{self.model.__name__} doesn't support count_by_project"
             )
@@ -128,19 +181,20 @@ class BaseRepository(Generic[ModelType], ABC):
         filters = {**additional_filters}
         if project_name:
             filters["project_name"] = project_name
-        if active_only and hasattr(self.model, "is_active"):
+        if active_only and "is_active" in self._cols:
             filters["is_active"] = True
 
-        return await self.count(**filters)
+        return await self.count_estimate(**filters)
 
     async def update(self, id: int, **kwargs) -> Optional[ModelType]:
-        """Update a record by ID."""
-        await self.session.execute(
+        """Update a record by ID, returning the updated record in one round trip."""
+        result = await self.session.execute(
             update(self.model)
             .where(self.model.id == id)  # type: ignore
             .values(**kwargs)
+            .returning(self.model)
         )
-        return await self.get_by_id(id)
+        return result.scalar_one_or_none()
 
     async def update_from_schema(
         self, id: int, schema: BaseModel
@@ -153,32 +207,78 @@ class BaseRepository(Generic[ModelType], ABC):
 
     async def delete(self, id: int) -> bool:
         """Delete a record by ID."""
+        model = self.model
         result = await self.session.execute(
-            delete(self.model).where(self.model.id == id)  # type: ignore
+            lambda_stmt(lambda: delete(model).where(model.id == id))  # type: ignore
         )
         return result.rowcount > 0
 
-    async def count(self, **filters: Any) -> int:
-        """Count records with optional filtering."""
-        query = select(func.count(self.model.id))  # type: ignore
+    async def delete_many(self, ids: Sequence[int]) -> int:
+        """
+        Delete the records with the given IDs in one statement.
 
-        # Apply filters
-        for key, value in filters.items():
-            if hasattr(self.model, key) and value is not None:
-                query = query.where(getattr(self.model, key) == value)
+        The IDs are bound as a single array parameter (`id = ANY(:ids)`), so
+        the statement is the same whatever the number of IDs. Returns the
+        number of deleted records.
+        """
+        if not ids:
+            return 0
+        model = self.model
+        ids_param = bindparam("ids", list(ids), type_=ARRAY(Integer))
+        result = await self.session.execute(
+            delete(model).where(model.id == any_(ids_param))  # type: ignore
+        )
+        return result.rowcount
 
+    async def count(self, **filters: Any) -> int:
+        """Count records with optional filtering."""
+        # count(*) rather than count(id), which lets Postgres use any index
+        query = self._apply_filters(
+            select(func.count()).select_from(self.model), filters
+        )
         result = await self.session.execute(query)
         return result.scalar() or 0
 
+    async def count_estimate(self, **filters: Any) -> int:
+        """
+        Count records, estimating the total of large tables when unfiltered.
+
+        An unfiltered count scans the whole table, so on Postgres the planner's
+        row estimate for the table is returned instead once it is above
+        COUNT_ESTIMATE_THRESHOLD. Filtered counts and smaller tables, whose
+        estimate may be stale or missing, are counted exactly.
+        """
+        if (
+            all(value is None for value in filters.values())
+            and self.session.bind.dialect.name == "postgresql"
+        ):
+            result = await self.session.execute(
+                text(
+                    "SELECT reltuples::bigint FROM pg_class "
+                    "WHERE oid = to_regclass(:table)"
+                ),
+                {"table": self.model.__tablename__},
+            )
+            estimate = result.scalar()
+            if estimate is not None and estimate >= COUNT_ESTIMATE_THRESHOLD:
+                return int(estimate)
+        return await self.count(**filters)
+
     async def exists(self, **filters: Any) -> bool:
         """Check if a record exists with given filters."""
-        query = select(self.model)
+        # Select a constant so no ORM object is built for the matching row
+        query = self._apply_filters(
+            select(literal(1)).select_from(self.model), filters
+        ).limit(1)
+        result = await self.session.execute(query)
+        return result.scalar() is not None
 
-        # Apply filters
+    def _apply_filters(
+        self, query: Select[Any], filters: Dict[str, Any]
+    ) -> Select[Any]:
+        """Add an equality condition for each filter naming a column, skipping None."""
         for key, value in filters.items():
-            if hasattr(self.model, key) and value is not None:
-                query = query.where(getattr(self.model, key) == value)
-
-        query = query.limit(1)
-        result = await self.session.execute(query)
-        return result.first() is not None
+            col = self._cols.get(key)
+            if col is not None and value is not None:
+                query = query.where(col == value)
+        return query
@@ -1,18 +1,28 @@
 """Repository for managing task templates and tasks in the database."""
 
-from typing import Any, List, Optional
+from typing import Any, Callable, List, Optional
 
-from sqlalchemy import select, update
+from sqlalchemy import Select, lambda_stmt, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import joinedload
 
-from app.databases.models import Inventory, SSHKeyPair, Task, TaskTemplate
-from app.repositories import BaseRepository
+from app.databases.models import SSHKeyPair, Task, TaskTemplate
+from app.repositories import BaseRepository, maybe_raiseload
 from app.schemas.task_schema import (
     TaskCreate,
 )
 
 
+def _where_equals(column: Any, value: Any) -> Callable[[Select], Select]:
+    """
+    Build a `lambda_stmt` step filtering on `column == value`.
+
+    Each filter needs a closure of its own: lambdas created in a loop would
+    share the loop variables and all bind the last value.
+    """
+    return lambda s: s.where(column == value)
+
+
 class TaskTemplateRepository(BaseRepository[TaskTemplate]):
     """Repository for task template database operations."""
 
@@ -50,16 +60,19 @@ class TaskRepository(BaseRepository[Task]):
         return await self.create(**task_dict)
 
     async def get_by_id(self, task_id: int) -> Optional[Task]:
-        """Get a task by ID with template and target relationships."""
+        """
+        Get a task by ID with its template and SSH key, in a single query.
+
+        Both are many-to-one, so they are joined into the task row. The target
+        IPs and inventories are not part of the task response and are not
+        loaded.
+        """
         result = await self.session.execute(
             select(Task)
             .options(
-                selectinload(Task.template),
-                selectinload(Task.target_ip_addresses),
-                selectinload(Task.target_inventories).selectinload(
-                    Inventory.ip_addresses
-                ),
-                selectinload(Task.ssh_key),
+                joinedload(Task.template),
+                joinedload(Task.ssh_key),
+                *maybe_raiseload(),
             )
             .where(Task.id == task_id)
         )
@@ -73,19 +86,32 @@ class TaskRepository(BaseRepository[Task]):
         active_only: bool = True,
         **additional_filters: Any,
     ) -> List[Task]:
-        """List tasks by project and optionally workspace."""
-        query = select(Task).options(selectinload(Task.template))
+        """
+        List tasks by project and optionally workspace.
+
+        The template and SSH key are many-to-one, so they are joined into each
+        task row and the list takes a single query.
+        """
+        # lambda_stmt caches the statement for each combination of filters,
+        # with the filter values, offset and limit as bound parameters, so it
+        # is not rebuilt and recompiled on each call
+        stmt = lambda_stmt(
+            lambda: select(Task).options(
+                joinedload(Task.template), joinedload(Task.ssh_key)
+            )
+        )
         if project_name:
-            query = query.where(Task.project_name == project_name)
+            stmt += lambda s: s.where(Task.project_name == project_name)
 
         # Apply additional filters
         for key, value in additional_filters.items():
-            if hasattr(Task, key) and value is not None:
-                query = query.where(getattr(Task, key) == value)
+            column = self._cols.get(key)
+            if column is not None and value is not None:
+                stmt += _where_equals(column, value)
 
-        query = query.offset(skip).limit(limit).order_by(Task.created_at.desc())
+        stmt += lambda s: s.order_by(Task.created_at.desc()).offset(skip).limit(limit)
 
-        result = await self.session.execute(query)
+        result = await self.session.execute(stmt)
         return list(result.scalars().all())
 
     async def update_status(
@@ -105,10 +131,10 @@ class TaskRepository(BaseRepository[Task]):
         return await self.update(task_id, **update_data)
 
     async def list_all_tasks(self, skip: int = 0, limit: int = 100) -> List[Task]:
-        """List all tasks with template relationships."""
+        """List all tasks with their template and SSH key, joined in a single query."""
         query = (
             select(Task)
-            .options(selectinload(Task.template))
+            .options(joinedload(Task.template), joinedload(Task.ssh_key))
             .offset(skip)
             .limit(limit)
             .order_by(Task.created_at.desc())
@@ -138,13 +164,7 @@ class SSHKeyRepository(BaseRepository[SSHKeyPair]):
         """Update the last used timestamp for an SSH key."""
         from sqlalchemy.sql import func
 
-        await self.session.execute(
-            update(SSHKeyPair)
-            .where(SSHKeyPair.id == ssh_key_id)
-            .values(last_used_at=func.now())
-        )
-
-        return await self.get_by_id(ssh_key_id)
+        return await self.update(ssh_key_id, last_used_at=func.now())
 
     async def get_all_active(
         self, skip: int = 0, limit: int = 100, active_only: bool = True
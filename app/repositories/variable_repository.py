@@ -1,14 +1,17 @@
 """Repository for managing variables in the database."""
 
-from typing import Any, List, Optional
+from typing import Any, AsyncIterator, List, Optional, Tuple
 
-from sqlalchemy import and_, delete, select, update
+from sqlalchemy import Row, and_, case, delete, func, insert, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.databases.models import Variable, VariableType
 from app.repositories import BaseRepository
 from app.schemas.variable_schema import VariableCreate, VariableResponse, VariableUpdate
 
+# Rows fetched per round trip when streaming variables from a server-side cursor
+STREAM_BATCH_SIZE = 500
+
 
 class VariableRepository(BaseRepository[Variable]):
     """Repository for variable database operations."""
@@ -56,16 +59,110 @@ class VariableRepository(BaseRepository[Variable]):
         result = await self.session.execute(query)
         return list(result.scalars().all())
 
-    async def list_all(
+    async def stream_by_project(
+        self,
+        project_name: str,
+        workspace_name: Optional[str] = None,
+        variable_type: Optional[VariableType] = VariableType.TERRAFORM,
+    ) -> AsyncIterator[Variable]:
+        """
+        Stream the variables of a project and optional workspace.
+
+        Rows are read from a server-side cursor in batches of
+        STREAM_BATCH_SIZE, so only one batch is held in memory at a time.
+        """
+        conditions = [Variable.project_name == project_name]
+        if workspace_name:
+            conditions.append(Variable.workspace_name == workspace_name)
+        if variable_type:
+            conditions.append(Variable.variable_type == variable_type)
+        query = (
+            select(Variable)
+            .where(and_(*conditions))
+            .order_by(Variable.id)
+            .execution_options(yield_per=STREAM_BATCH_SIZE)
+        )
+
+        result = await self.session.stream_scalars(query)
+        async for variable in result:
+            yield variable
+
+    async def list_deployment_variables(
+        self, project_name: str, workspace_name: str
+    ) -> List[Row[Tuple[str, Any, str]]]:
+        """
+        List the PROJECT variables of a project together with the INSTANCE
+        variables of one of its workspaces, in a single query.
+
+        Only the `key`, `value` and `description` columns are fetched, with a
+        missing or empty description returned as "Variables". Rows are ordered
+        by description, so that each description is one run of rows, then
+        PROJECT before INSTANCE, so that within it an INSTANCE variable
+        exported after a PROJECT one with the same key overrides it, then by
+        key.
+        """
+        description = func.coalesce(
+            func.nullif(Variable.description, ""), "Variables"
+        ).label("description")
+        query = (
+            select(Variable.key, Variable.value, description)
+            .where(
+                Variable.project_name == project_name,
+                or_(
+                    Variable.variable_type == VariableType.PROJECT,
+                    and_(
+                        Variable.variable_type == VariableType.INSTANCE,
+                        Variable.workspace_name == workspace_name,
+                    ),
+                ),
+            )
+            .order_by(
+                description,
+                case((Variable.variable_type == VariableType.PROJECT, 0), else_=1),
+                Variable.key,
+            )
+        )
+        result = await self.session.execute(query)
+        return list(result.all())
+
+    async def count_by_group(
+        self,
+    ) -> List[Row[Tuple[str, Optional[str], VariableType, int, int]]]:
+        """
+        Count variables per project, workspace and variable type.
+
+        Each row is `(project_name, workspace_name, variable_type, count,
+        sensitive_count)`, so statistics can be aggregated from one row per
+        group instead of one per variable.
+        """
+        query = select(
+            Variable.project_name,
+            Variable.workspace_name,
+            Variable.variable_type,
+            func.count(),
+            func.count().filter(Variable.is_sensitive),
+        ).group_by(
+            Variable.project_name, Variable.workspace_name, Variable.variable_type
+        )
+        result = await self.session.execute(query)
+        return list(result.all())
+
+    async def list_all_with_total(
         self,
         skip: int = 0,
         limit: int = 100,
         project_filter: Optional[str] = None,
         workspace_filter: Optional[str] = None,
         variable_type_filter: Optional[VariableType] = None,
-    ) -> List[Variable]:
-        """List all variables with optional filters."""
-        query = select(Variable)
+    ) -> Tuple[List[Variable], int]:
+        """
+        List variables with optional filters, along with the total number of
+        matching variables.
+
+        The total is computed by a window function in the same query; a
+        separate count is only needed when the page is past the last row.
+        """
+        query = select(Variable, func.count().over().label("total"))
 
         filters = []
         if project_filter:
@@ -80,16 +177,35 @@ class VariableRepository(BaseRepository[Variable]):
 
         query = query.offset(skip).limit(limit)
         result = await self.session.execute(query)
-        return list(result.scalars().all())
+        rows = result.all()
+        if rows:
+            return [row[0] for row in rows], rows[0][1]
+        if not skip:
+            return [], 0
+        total = await self.count(
+            project_name=project_filter or None,
+            workspace_name=workspace_filter or None,
+            variable_type=variable_type_filter or None,
+        )
+        return [], total
 
     # BaseRepository provides update() and delete() methods
 
     async def bulk_create(self, variables_data: List[VariableCreate]) -> List[Variable]:
-        """Create multiple variables in bulk."""
-        variables = [Variable(**var_data.model_dump()) for var_data in variables_data]
-        self.session.add_all(variables)
-        # Don't flush here - let the service handle transaction management
-        return variables
+        """
+        Create multiple variables in bulk with a single INSERT ... RETURNING.
+
+        Unlike `create`, the rows are inserted right away. SQLAlchemy splits
+        large inputs into batches that fit the driver's parameter limit, and
+        the variables are returned in the order of `variables_data`.
+        """
+        if not variables_data:
+            return []
+        result = await self.session.execute(
+            insert(Variable).returning(Variable, sort_by_parameter_order=True),
+            [var_data.model_dump() for var_data in variables_data],
+        )
+        return list(result.scalars().all())
 
     async def delete_by_project(
         self, project_name: str, workspace_name: Optional[str] = None
@@ -115,7 +231,12 @@ class VariableRepository(BaseRepository[Variable]):
         skip: int = 0,
         limit: int = 100,
     ) -> List[Variable]:
-        """Search variables by key or description."""
+        """
+        Search variables by key or description.
+
+        On PostgreSQL the substring match is served by the trigram indexes on
+        both columns (for terms of at least three characters).
+        """
         query = select(Variable).where(
             Variable.key.ilike(f"%{search_term}%")
             | Variable.description.ilike(f"%{search_term}%")
@@ -0,0 +1,38 @@
+"""Schema base classes shared by the other schema modules."""
+
+from typing import Any, Self
+
+from pydantic import BaseModel
+
+
+class OrmResponse(BaseModel):
+    """
+    Base for response schemas built from ORM rows.
+
+    `from_row` reads each field from the row and builds the model with
+    model_construct, without validation: the row comes from the database,
+    whose columns already enforce the schema. Only for schemas without
+    validators, and only for rows read back from the database; subclasses
+    declaring validators are rejected when the class is created.
+    """
+
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs: Any) -> None:
+        super().__pydantic_init_subclass__(**kwargs)
+        decorators = cls.__pydantic_decorators__
+        if (
+            decorators.validators
+            or decorators.field_validators
+            or decorators.root_validators
+            or decorators.model_validators
+        ):
+            raise TypeError(
+                f"{cls.__name__} declares validators, which from_row would skip"
+            )
+
+    @classmethod
+    def from_row(cls, row: Any) -> Self:
+        """Build the response from an ORM row, skipping validation."""
+        return cls.model_construct(
+            **{name: getattr(row, name) for name in cls.model_fields}
+        )
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class IPAddressBase(BaseModel):
@@ -22,8 +22,7 @@ class IPAddressResponse(IPAddressBase):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class InventoryBase(BaseModel):
@@ -51,8 +50,7 @@ class InventoryResponse(InventoryBase):
     updated_at: datetime
     ip_addresses: List[IPAddressResponse] = Field(default_factory=list)
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class InventoryUpdate(BaseModel):
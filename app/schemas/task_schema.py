@@ -3,9 +3,10 @@
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 from app.databases.models import SSHKeyType, TaskStatus, TaskTemplateType
+from app.schemas.common_schema import OrmResponse
 
 
 class TaskTemplateBase(BaseModel):
@@ -61,15 +62,14 @@ class TaskTemplateUpdate(BaseModel):
     )
 
 
-class TaskTemplateResponse(TaskTemplateBase):
+class TaskTemplateResponse(TaskTemplateBase, OrmResponse):
     """Schema for task template response."""
 
     id: int = Field(..., description="Template ID")
     created_at: datetime = Field(..., description="Creation timestamp")
     updated_at: datetime = Field(..., description="Last update timestamp")
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class TaskTemplateListResponse(BaseModel):
@@ -132,7 +132,7 @@ class SSHKeyPairUpdate(BaseModel):
     )
 
 
-class SSHKeyPairResponse(SSHKeyPairBase):
+class SSHKeyPairResponse(SSHKeyPairBase, OrmResponse):
     """Schema for SSH key pair response."""
 
     id: int = Field(..., description="Key pair ID")
@@ -145,8 +145,7 @@ class SSHKeyPairResponse(SSHKeyPairBase):
     updated_at: datetime = Field(..., description="Last update timestamp")
     last_used_at: Optional[datetime] = Field(None, description="Last usage timestamp")
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class SSHKeyPairListResponse(BaseModel):
@@ -193,7 +192,7 @@ class TaskCreate(TaskBase):
     )
 
 
-class TaskResponse(TaskBase):
+class TaskResponse(TaskBase, OrmResponse):
     """Schema for task response."""
 
     id: int = Field(..., description="Task ID")
@@ -211,8 +210,15 @@ class TaskResponse(TaskBase):
         None, description="Associated SSH key pair"
     )
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+    @classmethod
+    def from_row(cls, row: Any) -> "TaskResponse":
+        """Build the response from a Task row, with its template and SSH key."""
+        task = super().from_row(row)
+        task.template = TaskTemplateResponse.from_row(row.template)
+        task.ssh_key = SSHKeyPairResponse.from_row(row.ssh_key) if row.ssh_key else None
+        return task
 
 
 class TaskListResponse(BaseModel):
@@ -3,9 +3,10 @@
 from datetime import datetime
 from typing import Any, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 from app.databases.models import VariableType
+from app.schemas.common_schema import OrmResponse
 
 
 class VariableBase(BaseModel):
@@ -42,7 +43,7 @@ class VariableUpdate(BaseModel):
     workspace_name: Optional[str] = Field(None, description="Workspace name")
 
 
-class VariableResponse(VariableBase):
+class VariableResponse(VariableBase, OrmResponse):
     """Schema for variable response."""
 
     id: int
@@ -51,8 +52,7 @@ class VariableResponse(VariableBase):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class VariableListResponse(BaseModel):
@@ -0,0 +1,90 @@
+"""In-process queue for background jobs that should not hold up a response."""
+
+import math
+from collections.abc import Awaitable, Callable
+
+import anyio
+from anyio.abc import TaskGroup
+from anyio.streams.memory import MemoryObjectReceiveStream, MemoryObjectSendStream
+
+from app.logger import logger
+
+Job = Callable[[], Awaitable[None]]
+
+# Number of jobs allowed to run at the same time.
+WORKER_COUNT = 4
+# How long shutdown waits for queued jobs before cancelling them.
+DRAIN_TIMEOUT = 30.0
+
+
+class BackgroundQueue:
+    """
+    A queue of coroutine jobs consumed by a fixed pool of worker tasks.
+
+    The workers are started and stopped by the application lifespan, so jobs
+    run concurrently with requests and with each other, bounded by the number
+    of workers. `start` and `stop` must be awaited from the same task, as the
+    lifespan does.
+    """
+
+    def __init__(self, worker_count: int = WORKER_COUNT):
+        self.worker_count = worker_count
+        self._jobs: MemoryObjectSendStream[Job] | None = None
+        self._task_group: TaskGroup | None = None
+
+    async def start(self) -> None:
+        """Create the queue and start the worker tasks."""
+        send, receive = anyio.create_memory_object_stream[Job](math.inf)
+        self._task_group = anyio.create_task_group()
+        await self._task_group.__aenter__()
+        with receive:
+            for i in range(self.worker_count):
+                self._task_group.start_soon(
+                    self._worker, receive.clone(), name=f"bg-queue-worker-{i}"
+                )
+        self._jobs = send
+        logger.info("Background queue started with %s workers", self.worker_count)
+
+    def submit(self, job: Job) -> bool:
+        """
+        Queue a job; it runs as soon as a worker is free.
+
+        Returns False, and drops the job, if the queue is not running.
+        """
+        if self._jobs is None:
+            logger.warning("Background queue not started, dropping job %r", job)
+            return False
+        self._jobs.send_nowait(job)
+        return True
+
+    async def stop(self) -> None:
+        """Wait for queued jobs (up to `DRAIN_TIMEOUT`), then stop the workers."""
+        if self._jobs is None or self._task_group is None:
+            return
+        jobs, self._jobs = self._jobs, None
+        task_group, self._task_group = self._task_group, None
+        pending = jobs.statistics().current_buffer_used
+        # Workers exit once the closed queue is empty; past the deadline the
+        # jobs still running are cancelled
+        jobs.close()
+        task_group.cancel_scope.deadline = anyio.current_time() + DRAIN_TIMEOUT
+        await task_group.__aexit__(None, None, None)
+        if task_group.cancel_scope.cancelled_caught:
+            logger.warning(
+                "Background queue cancelled its jobs at shutdown (%s were queued)",
+                pending,
+            )
+        logger.info("Background queue stopped")
+
+    async def _worker(self, jobs: MemoryObjectReceiveStream[Job]) -> None:
+        async with jobs:
+            async for job in jobs:
+                try:
+                    await job()
+                # A failed job must not stop the worker
+                except Exception:  # noqa: BLE001
+                    logger.exception("Background job failed")
+
+
+# Global background queue instance, started by the application lifespan
+background_queue = BackgroundQueue()
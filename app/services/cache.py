@@ -0,0 +1,87 @@
+"""Small in-process caches with a time-to-live."""
+
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Awaitable, Callable, Hashable, Optional, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_MAXSIZE = 256
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    A bounded mapping whose entries expire `ttl` seconds after being set.
+
+    When full, the least recently set entry is evicted first. The cache is
+    local to the process, so each worker keeps its own copy.
+    """
+
+    def __init__(self, ttl: float, maxsize: int = DEFAULT_MAXSIZE):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for `key`, or `default` if absent or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        expires, value = entry
+        if expires <= time.monotonic():
+            del self._entries[key]
+            return default
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Cache `value` under `key` for `ttl` seconds."""
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Forget the cached value for `key`, if any."""
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Forget all cached values."""
+        self._entries.clear()
+
+
+def cached(
+    ttl: float,
+    maxsize: int = DEFAULT_MAXSIZE,
+    key: Optional[Callable[..., Hashable]] = None,
+) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """
+    Cache the results of an async function for `ttl` seconds.
+
+    Results are keyed by the call arguments, or by `key(*args, **kwargs)` when
+    given (e.g. to leave `self` out of the key of a method). The `TTLCache` is
+    exposed as the `cache` attribute of the wrapper for invalidation.
+    """
+
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        cache = TTLCache(ttl, maxsize)
+
+        @wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> T:
+            cache_key = (
+                key(*args, **kwargs)
+                if key is not None
+                else (args, tuple(sorted(kwargs.items())))
+            )
+            value = cache.get(cache_key, _MISSING)
+            if value is _MISSING:
+                value = await func(*args, **kwargs)
+                cache.set(cache_key, value)
+            return value
+
+        wrapper.cache = cache  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorator
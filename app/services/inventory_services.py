@@ -1,9 +1,9 @@
 import asyncio
-import json
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional, cast
 
+import orjson
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.databases.models import Inventory, IPAddress
@@ -41,7 +41,7 @@ class InventoryService:
             )
             await self.db.commit()
             return self._create_sync_response(project_name, workspace_name, sync_stats)
-        except (RuntimeError, json.JSONDecodeError):
+        except (RuntimeError, orjson.JSONDecodeError):
             raise
         except Exception as e:
             logger.error(f"Error updating inventory from Terraform outputs: {e}")
@@ -114,7 +114,8 @@ class InventoryService:
         if process.returncode != 0:
             raise RuntimeError(f"Terraform command failed: {stderr.decode()}")
 
-        return cast(Dict[str, Any], json.loads(stdout.decode()))
+        # orjson parses the raw bytes, without decoding them to a str first
+        return cast(Dict[str, Any], orjson.loads(stdout))
 
     def _initialize_sync_stats(self) -> Dict[str, Any]:
         """Initialize statistics tracking for sync operation."""
@@ -305,27 +306,16 @@ class InventoryService:
             processing_stats["updated_inventories"].append(inventory_name)
             return existing_constraint
 
-        # Check for exact match (name + project + workspace)
-        existing_exact = await self.inventory_repo.get_by_name_and_project(
-            inventory_name, project_name, workspace_name
-        )
-
+        # Name + project is unique, so an inventory also matching the workspace
+        # would have been found above: this one is new
         inventory_data = self._build_inventory_data(
             inventory_name, project_name, workspace_name, output_key, output_value
         )
-
-        if existing_exact:
-            await self.inventory_repo.update(existing_exact.id, **inventory_data)
-            processing_stats["items_updated"] += 1
-            processing_stats["updated_inventories"].append(inventory_name)
-            logger.info(f"Updated inventory: {inventory_name}")
-            return existing_exact
-        else:
-            new_inventory = await self.inventory_repo.create(**inventory_data)
-            processing_stats["items_created"] += 1
-            processing_stats["created_inventories"].append(inventory_name)
-            logger.info(f"Created inventory: {inventory_name}")
-            return new_inventory
+        new_inventory = await self.inventory_repo.create(**inventory_data)
+        processing_stats["items_created"] += 1
+        processing_stats["created_inventories"].append(inventory_name)
+        logger.info(f"Created inventory: {inventory_name}")
+        return new_inventory
 
     def _build_inventory_data(
         self,
@@ -387,19 +377,17 @@ class InventoryService:
         processing_stats: Dict[str, Any],
     ) -> IPAddress:
         """Get existing IP or create new one."""
-        existing_ip = await self.ip_repo.get_by_ip(ip_str)
-        if existing_ip:
-            processing_stats["ips_updated"] += 1
-            return existing_ip
-        else:
-            new_ip = await self.ip_repo.create(
-                ip=ip_str,
-                description=f"IP from Terraform output: {output_key}",
-                workspace=workspace_name,
-            )
+        ip_address, created = await self.ip_repo.get_or_create_ip(
+            ip_str,
+            description=f"IP from Terraform output: {output_key}",
+            workspace=workspace_name,
+        )
+        if created:
             processing_stats["ips_created"] += 1
             logger.info(f"Created IP: {ip_str}")
-            return new_ip
+        else:
+            processing_stats["ips_updated"] += 1
+        return ip_address
 
     async def _process_pending_associations(
         self, pending_associations: List[Dict[str, Any]]
@@ -546,25 +534,24 @@ class InventoryService:
                 project_name, workspace_name
             )
 
-            deleted_count = 0
+            # Delete the inventory items in one statement (cascade will handle
+            # IP associations)
+            deleted_count = await self.inventory_repo.delete_many(
+                [inventory.id for inventory in inventories]
+            )
             for inventory in inventories:
-                # Delete the inventory item (cascade will handle IP associations)
-                success = await self.inventory_repo.delete(inventory.id)
-                if success:
-                    deleted_count += 1
-                    logger.info(
-                        f"Deleted inventory '{inventory.name}' (ID: {inventory.id})"
-                    )
+                logger.info(
+                    f"Deleted inventory '{inventory.name}' (ID: {inventory.id})"
+                )
 
             # Clean up orphaned IP addresses that belong to this workspace
             if workspace_name:
                 orphaned_ips = await self._find_orphaned_workspace_ips(workspace_name)
-                deleted_ip_count = 0
+                deleted_ip_count = await self.ip_repo.delete_many(
+                    [ip.id for ip in orphaned_ips]
+                )
                 for ip in orphaned_ips:
-                    success = await self.ip_repo.delete(ip.id)
-                    if success:
-                        deleted_ip_count += 1
-                        logger.info(f"Deleted orphaned IP '{ip.ip}' (ID: {ip.id})")
+                    logger.info(f"Deleted orphaned IP '{ip.ip}' (ID: {ip.id})")
 
                 if deleted_ip_count > 0:
                     logger.info(f"Cleaned up {deleted_ip_count} orphaned IP addresses")
@@ -588,12 +575,18 @@ class InventoryService:
     async def get_inventory(
         self, project_name: str, workspace_name: Optional[str] = None
     ) -> List[InventoryResponse]:
-        """Get inventory for a specific project and optional workspace."""
+        """
+        Get inventory for a specific project and optional workspace.
+
+        The rows come straight from the database, whose columns already
+        enforce the schema constraints, so the responses are built with
+        model_construct instead of being validated field by field.
+        """
         inventories = await self.inventory_repo.get_by_project_workspace(
             project_name, workspace_name
         )
         return [
-            InventoryResponse(
+            InventoryResponse.model_construct(
                 id=inv.id,
                 name=inv.name,
                 project_name=inv.project_name,
@@ -604,7 +597,7 @@ class InventoryService:
                 created_at=inv.created_at,
                 updated_at=inv.updated_at,
                 ip_addresses=[
-                    IPAddressResponse(
+                    IPAddressResponse.model_construct(
                         id=ip.id,
                         ip=ip.ip,
                         description=ip.description,
@@ -6,7 +6,7 @@ import hcl2
 from app.exceptions import TerraformInitError
 from app.logger import logger
 from app.schemas import ProjectOutput
-from app.services.terraform_services import execute_terraform_command
+from app.services.terraform_services import execute_terraform_command, init_lock
 from app.var_type import TFVars
 
 
@@ -32,7 +32,9 @@ async def get_projects() -> list[ProjectOutput]:
     _path_exists(infra_path)
 
     dir_list = [
-        ProjectOutput(name=project.name, description=await _get_description(project))
+        ProjectOutput.model_construct(
+            name=project.name, description=await _get_description(project)
+        )
         for project in infra_path.glob("*/")
         if project.is_dir()
     ]
@@ -48,7 +50,7 @@ async def get_project(project_name: str) -> ProjectOutput:
     _path_exists(project_path)
 
     description = await _get_description(project_path)
-    return ProjectOutput(name=project_name, description=description)
+    return ProjectOutput.model_construct(name=project_name, description=description)
 
 
 async def get_tfvars(project_name: str) -> TFVars:
@@ -109,7 +111,8 @@ async def init_project(
         command += " -migrate-state -force-copy"
 
     try:
-        res = await execute_terraform_command(tf_path, command)
+        async with init_lock(tf_path):
+            res = await execute_terraform_command(tf_path, command)
     except RuntimeError as err:
         raise TerraformInitError(str(err)) from err
 
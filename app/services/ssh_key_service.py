@@ -3,6 +3,7 @@
 import base64
 import hashlib
 import os
+from functools import lru_cache
 from typing import List, Optional
 
 from cryptography.hazmat.backends import default_backend
@@ -29,6 +30,26 @@ from app.schemas.task_schema import (
 )
 
 
+@lru_cache(maxsize=1)
+def _derive_encryption_key(secret: str) -> bytes:
+    """Derive the 32-byte AES-256 key from the configured secret."""
+    return hashlib.sha256(secret.encode()).digest()
+
+
+def get_encryption_key() -> bytes:
+    """
+    Return the key used to encrypt stored private keys.
+
+    The derivation is cached per secret, so services built for each request
+    do not re-hash it.
+    """
+    # In production, this should be stored in environment variables or a secure key management system
+    encryption_key = os.getenv("SSH_KEY_ENCRYPTION_KEY")
+    if not encryption_key:
+        raise ValueError("SSH_KEY_ENCRYPTION_KEY environment variable is required")
+    return _derive_encryption_key(encryption_key)
+
+
 class SSHKeyService:
     """Service for SSH key pair management."""
 
@@ -39,13 +60,7 @@ class SSHKeyService:
 
     def _get_encryption_key(self) -> bytes:
         """Get or create encryption key for private key storage."""
-        # In production, this should be stored in environment variables or a secure key management system
-        encryption_key = os.getenv("SSH_KEY_ENCRYPTION_KEY")
-        if not encryption_key:
-            raise ValueError("SSH_KEY_ENCRYPTION_KEY environment variable is required")
-
-        # Ensure key is 32 bytes for AES-256
-        return hashlib.sha256(encryption_key.encode()).digest()
+        return get_encryption_key()
 
     def _encrypt_private_key(
         self, private_key: str, passphrase: Optional[str] = None
@@ -350,7 +365,7 @@ class SSHKeyService:
         if not ssh_key:
             raise EntityNotFoundError(f"SSH key with ID {ssh_key_id} not found")
 
-        return SSHKeyPairResponse.model_validate(ssh_key)
+        return SSHKeyPairResponse.from_row(ssh_key)
 
     async def get_public_key(self, ssh_key_id: int) -> SSHPublicKeyResponse:
         """Get public key for export."""
@@ -396,9 +411,11 @@ class SSHKeyService:
             project_name, active_only
         )
 
-        ssh_key_responses = [SSHKeyPairResponse.model_validate(key) for key in ssh_keys]
+        ssh_key_responses = [SSHKeyPairResponse.from_row(key) for key in ssh_keys]
 
-        return SSHKeyPairListResponse(ssh_keys=ssh_key_responses, total=total)
+        return SSHKeyPairListResponse.model_construct(
+            ssh_keys=ssh_key_responses, total=total
+        )
 
     async def update_key(
         self, ssh_key_id: int, key_data: SSHKeyPairUpdate
@@ -2,13 +2,13 @@
 
 import asyncio
 import base64
-import hashlib
 import json
 import os
 import tempfile
 from pathlib import Path
-from typing import AsyncGenerator, Dict, List, Optional
+from typing import AsyncGenerator, Dict, List, Optional, Tuple
 
+import orjson
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 from fastapi import HTTPException
@@ -37,7 +37,7 @@ from app.repositories.task_repository import (
     TaskTemplateRepository,
 )
 from app.schemas.task_schema import TaskCreate, TaskResponse
-from app.services.ssh_key_service import SSHKeyService
+from app.services.ssh_key_service import SSHKeyService, get_encryption_key
 
 # Base tasks directory path
 TASKS_DIR = Path(__file__).parent.parent.parent / "tasks"
@@ -50,6 +50,31 @@ OUTPUT_TIMEOUT = 30.0
 OVERALL_TIMEOUT = 120.0
 
 
+def sse_event(status: str, message: str) -> bytes:
+    """Encode a single server-sent event frame carrying a status payload."""
+    return b"data: " + orjson.dumps({"status": status, "message": message}) + b"\n\n"
+
+
+# Frames that never change are encoded once at import time.
+_SSE_PREPARING = sse_event("preparing", "📋 Preparing task execution...")
+_SSE_COMPLETED = sse_event("completed", "✅ Task execution completed")
+_SSE_ANSIBLE_PREP = sse_event("ansible_prep", "🔧 Preparing Ansible execution...")
+_SSE_BASH_PREP = sse_event("bash_prep", "🐚 Preparing Bash execution...")
+_SSE_TEMPLATE_RENDERED = sse_event(
+    "bash_prep", "🔧 Template rendered with parameters..."
+)
+_SSE_COMMAND_SUCCESS = sse_event("success", "✅ Command completed successfully")
+_SSE_NO_OUTPUT_WARNING = sse_event(
+    "warning",
+    f"⚠️ No output for {OUTPUT_TIMEOUT} seconds, command may be hanging...",
+)
+_SSE_OVERALL_TIMEOUT = sse_event(
+    "error",
+    f"❌ Command timed out after {OVERALL_TIMEOUT/60} minutes, terminating...",
+)
+_SSE_EXECUTION_TIMEOUT = sse_event("error", "❌ Command execution timed out")
+
+
 class TaskExecutionService:
     """Service for task execution operations."""
 
@@ -66,10 +91,7 @@ class TaskExecutionService:
     @staticmethod
     def _get_encryption_key() -> bytes:
         """Get encryption key for private key storage."""
-        encryption_key = os.getenv("SSH_KEY_ENCRYPTION_KEY")
-        if not encryption_key:
-            raise ValueError("SSH_KEY_ENCRYPTION_KEY environment variable is required")
-        return hashlib.sha256(encryption_key.encode()).digest()
+        return get_encryption_key()
 
     @staticmethod
     def _render_template_with_parameters(
@@ -138,7 +160,7 @@ class TaskExecutionService:
     @staticmethod
     async def _stream_command_output(
         cmd: List[str], stdin_file: Optional[Path] = None
-    ) -> AsyncGenerator[str, None]:
+    ) -> AsyncGenerator[bytes, None]:
         """Stream command output with proper error handling."""
         try:
             stdin_data = None
@@ -157,7 +179,10 @@ class TaskExecutionService:
                     timeout=PROCESS_START_TIMEOUT,
                 )
             except asyncio.TimeoutError:
-                yield f'data: {{"status": "error", "message": "❌ Command failed to start within {PROCESS_START_TIMEOUT} seconds"}}\n\n'  # noqa: E501
+                yield sse_event(
+                    "error",
+                    f"❌ Command failed to start within {PROCESS_START_TIMEOUT} seconds",
+                )
                 return
 
             if stdin_data and process.stdin:
@@ -179,14 +204,11 @@ class TaskExecutionService:
                                 "\n\r"
                             )
                             if clean_line:
-                                escaped_line = clean_line.replace('"', '\\"').replace(
-                                    "\n", "\\n"
-                                )
-                                yield f'data: {{"status": "output", "message": "{escaped_line}"}}\n\n'
+                                yield sse_event("output", clean_line)
 
                         except asyncio.TimeoutError:
                             if process.returncode is None:
-                                yield f'data: {{"status": "warning", "message": "⚠️ No output for {OUTPUT_TIMEOUT} seconds, command may be hanging..."}}\n\n'  # noqa: E501
+                                yield _SSE_NO_OUTPUT_WARNING
                                 continue
                             else:
                                 break
@@ -195,7 +217,7 @@ class TaskExecutionService:
                 try:
                     await asyncio.wait_for(process.wait(), timeout=OVERALL_TIMEOUT)
                 except asyncio.TimeoutError:
-                    yield f'data: {{"status": "error", "message": "❌ Command timed out after {OVERALL_TIMEOUT/60} minutes, terminating..."}}\n\n'  # noqa: E501
+                    yield _SSE_OVERALL_TIMEOUT
                     process.terminate()
                     try:
                         await asyncio.wait_for(process.wait(), timeout=5.0)
@@ -204,18 +226,20 @@ class TaskExecutionService:
                     return
 
             except asyncio.TimeoutError:
-                yield f'data: {{"status": "error", "message": "❌ Command execution timed out"}}\n\n'
+                yield _SSE_EXECUTION_TIMEOUT
                 process.terminate()
                 return
 
             if process.returncode != 0:
-                yield f'data: {{"status": "error", "message": "❌ Command failed with exit code {process.returncode}"}}\n\n'  # noqa: E501
+                yield sse_event(
+                    "error", f"❌ Command failed with exit code {process.returncode}"
+                )
             else:
-                yield f'data: {{"status": "success", "message": "✅ Command completed successfully"}}\n\n'
+                yield _SSE_COMMAND_SUCCESS
 
         except Exception as e:
             logger.error(f"Error executing command: {str(e)}")
-            yield f'data: {{"status": "error", "message": "❌ Failed to execute command: {str(e)}"}}\n\n'
+            yield sse_event("error", f"❌ Failed to execute command: {str(e)}")
 
     # Target Host Resolution (consolidated)
     async def _get_target_hosts(self, task_data: TaskCreate) -> List[str]:
@@ -276,7 +300,7 @@ class TaskExecutionService:
         template: TaskTemplate,
         target_hosts: List[str],
         ssh_key_path: Optional[str] = None,
-    ) -> AsyncGenerator[str, None]:
+    ) -> AsyncGenerator[bytes, None]:
         """Execute Ansible task with streaming output."""
         async for chunk in self._execute_ansible_task_static(
             task, template, target_hosts, ssh_key_path
@@ -289,9 +313,9 @@ class TaskExecutionService:
         template: TaskTemplate,
         target_hosts: List[str],
         ssh_key_path: Optional[str] = None,
-    ) -> AsyncGenerator[str, None]:
+    ) -> AsyncGenerator[bytes, None]:
         """Execute Ansible task with streaming output (static version)."""
-        yield 'data: {"status": "ansible_prep", "message": "🔧 Preparing Ansible execution..."}\n\n'
+        yield _SSE_ANSIBLE_PREP
 
         # Create inventory file
         inventory_content = "[targets]\n" + "\n".join(target_hosts)
@@ -325,7 +349,7 @@ class TaskExecutionService:
                 for key, value in task.parameters.items():
                     cmd.extend(["-e", f"{key}={value}"])
 
-            yield f'data: {{"status": "executing", "message": "▶️ Running: {" ".join(cmd)}"}}\n\n'
+            yield sse_event("executing", f"▶️ Running: {' '.join(cmd)}")
 
             async for output_chunk in TaskExecutionService._stream_command_output(cmd):
                 yield output_chunk
@@ -341,7 +365,7 @@ class TaskExecutionService:
         template: TaskTemplate,
         target_hosts: List[str],
         ssh_key_path: Optional[str] = None,
-    ) -> AsyncGenerator[str, None]:
+    ) -> AsyncGenerator[bytes, None]:
         """Execute Bash task with streaming output."""
         async for chunk in self._execute_bash_task_static(
             task, template, target_hosts, ssh_key_path
@@ -354,9 +378,9 @@ class TaskExecutionService:
         template: TaskTemplate,
         target_hosts: List[str],
         ssh_key_path: Optional[str] = None,
-    ) -> AsyncGenerator[str, None]:
+    ) -> AsyncGenerator[bytes, None]:
         """Execute Bash task with streaming output (static version)."""
-        yield 'data: {"status": "bash_prep", "message": "🐚 Preparing Bash execution..."}\n\n'
+        yield _SSE_BASH_PREP
 
         script_path = TASKS_DIR / template.file_path
 
@@ -367,9 +391,9 @@ class TaskExecutionService:
                     script_path, task.parameters
                 )
             )
-            yield 'data: {"status": "bash_prep", "message": "🔧 Template rendered with parameters..."}\n\n'
+            yield _SSE_TEMPLATE_RENDERED
         except Exception as e:
-            yield f'data: {{"status": "error", "message": "❌ Template rendering failed: {str(e)}"}}\n\n'
+            yield sse_event("error", f"❌ Template rendering failed: {str(e)}")
             return
 
         # Create temporary file with rendered content
@@ -380,7 +404,7 @@ class TaskExecutionService:
 
         try:
             for host in target_hosts:
-                yield f'data: {{"status": "executing", "message": "🔄 Executing on {host}..."}}\n\n'
+                yield sse_event("executing", f"🔄 Executing on {host}...")
 
                 if host == "localhost":
                     cmd = ["bash", temp_script.name]
@@ -405,7 +429,7 @@ class TaskExecutionService:
                         ]
                     )
 
-                    yield f'data: {{"status": "executing", "message": "▶️ Running SSH: {host}"}}\n\n'
+                    yield sse_event("executing", f"▶️ Running SSH: {host}")
 
                     async for (
                         output_chunk
@@ -483,7 +507,7 @@ class TaskExecutionService:
     @staticmethod
     async def execute_task_streaming_static(
         task_execution_data: Dict,
-    ) -> AsyncGenerator[str, None]:
+    ) -> AsyncGenerator[bytes, None]:
         """Static method to execute a task with streaming output (no database operations)."""
         task = task_execution_data["task"]
         template = task_execution_data["template"]
@@ -491,7 +515,7 @@ class TaskExecutionService:
         ssh_key_data = task_execution_data["ssh_key_data"]
 
         try:
-            yield 'data: {"status": "preparing", "message": "📋 Preparing task execution..."}\n\n'
+            yield _SSE_PREPARING
 
             # Prepare SSH key if needed
             ssh_key_path = None
@@ -514,15 +538,15 @@ class TaskExecutionService:
                 ):
                     yield log_chunk
             else:
-                error_msg = f"❌ Unsupported template type: {template.template_type}"
-                yield f'data: {{"status": "error", "message": "{error_msg}"}}\n\n'
+                yield sse_event(
+                    "error", f"❌ Unsupported template type: {template.template_type}"
+                )
                 return
 
-            yield 'data: {"status": "completed", "message": "✅ Task execution completed"}\n\n'
+            yield _SSE_COMPLETED
 
         except Exception as e:
-            error_msg = f"❌ Execution failed: {str(e)}"
-            yield f'data: {{"status": "error", "message": "{error_msg}"}}\n\n'
+            yield sse_event("error", f"❌ Execution failed: {str(e)}")
 
         finally:
             TaskExecutionService._cleanup_ssh_key(ssh_key_path)
@@ -533,7 +557,7 @@ class TaskExecutionService:
         task = await self.task_repo.get_by_id(task_id)
         if not task:
             raise HTTPException(status_code=404, detail="Task not found")
-        return TaskResponse.model_validate(task)
+        return TaskResponse.from_row(task)
 
     async def list_tasks_by_project(
         self,
@@ -546,7 +570,25 @@ class TaskExecutionService:
         tasks = await self.task_repo.list_by_project(
             project_name, workspace_name=workspace_name, skip=skip, limit=limit
         )
-        return [TaskResponse.model_validate(task) for task in tasks]
+        return [TaskResponse.from_row(task) for task in tasks]
+
+    async def list_tasks_by_project_paginated(
+        self,
+        project_name: str,
+        workspace_name: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> Tuple[List[TaskResponse], int]:
+        """List a page of tasks together with the total number of matching tasks."""
+        tasks = await self.list_tasks_by_project(
+            project_name, workspace_name=workspace_name, skip=skip, limit=limit
+        )
+        # The session cannot run two statements at once, so the count follows
+        # the page query instead of being gathered with it.
+        total = await self.task_repo.count_by_project(
+            project_name, workspace_name=workspace_name
+        )
+        return tasks, total
 
     async def mark_task_as_completed(self, task_execution_data: Dict) -> None:
         """Mark a task as completed."""
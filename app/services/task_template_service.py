@@ -102,7 +102,7 @@ class TaskTemplateService:
             if not template:
                 raise EntityNotFoundError("Task template not found")
 
-            return TaskTemplateResponse.model_validate(template)
+            return TaskTemplateResponse.from_row(template)
 
         except EntityNotFoundError:
             raise
@@ -192,11 +192,11 @@ class TaskTemplateService:
                 project_name, active_only=active_only
             )
 
-            template_responses = [
-                TaskTemplateResponse.model_validate(t) for t in templates
-            ]
+            template_responses = [TaskTemplateResponse.from_row(t) for t in templates]
 
-            return TaskTemplateListResponse(templates=template_responses, total=total)
+            return TaskTemplateListResponse.model_construct(
+                templates=template_responses, total=total
+            )
 
         except Exception as e:
             raise ServiceError(f"Failed to list templates by project: {str(e)}")
@@ -210,11 +210,9 @@ class TaskTemplateService:
                 skip=skip, limit=limit, active_only=active_only
             )
 
-            template_responses = [
-                TaskTemplateResponse.model_validate(t) for t in templates
-            ]
+            template_responses = [TaskTemplateResponse.from_row(t) for t in templates]
 
-            return TaskTemplateListResponse(
+            return TaskTemplateListResponse.model_construct(
                 templates=template_responses, total=len(template_responses)
             )
 
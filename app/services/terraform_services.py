@@ -1,18 +1,75 @@
 import asyncio
 import json
+import os
 import re
+from collections import defaultdict
 from pathlib import Path
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Callable
 
 from app.logger import logger
 from app.services.variable_services import VariableService
 
+# Upper bound for a single read from a terraform subprocess pipe.
+STREAM_CHUNK_SIZE = 64 * 1024
+
+TerraformVars = dict[str, str | int | float | bool]
+# Returns True once it has seen what it was looking for, to stop further calls
+ChunkCallback = Callable[[bytes], bool | None]
+ErrorCallback = Callable[[RuntimeError], bytes]
+
+# One lock per terraform directory, so two inits never run in it at once
+_init_locks: defaultdict[Path, asyncio.Lock] = defaultdict(asyncio.Lock)
+# With a plugin cache, all inits of the process share the cache directory,
+# which terraform does not support concurrent inits on: they take this lock
+_plugin_cache_init_lock = asyncio.Lock()
+
+
+def configure_plugin_cache(cache_dir: Path) -> Path:
+    """
+    Share downloaded providers between all terraform runs of this process.
+
+    Sets `TF_PLUGIN_CACHE_DIR` for the terraform subprocesses unless it is
+    already set, and makes sure the directory exists (terraform requires it).
+    """
+    cache_dir = Path(os.environ.setdefault("TF_PLUGIN_CACHE_DIR", str(cache_dir)))
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    logger.info(f"Terraform plugin cache directory: {cache_dir}")
+    return cache_dir
+
+
+def init_lock(project_path: Path) -> asyncio.Lock:
+    """
+    Get the lock serializing `terraform init` runs in the given directory.
+
+    When `TF_PLUGIN_CACHE_DIR` is set (see `configure_plugin_cache`), this is
+    a single lock for the whole process, so inits of different directories
+    do not race on the shared cache either.
+    """
+    if os.environ.get("TF_PLUGIN_CACHE_DIR"):
+        return _plugin_cache_init_lock
+    return _init_locks[project_path]
+
 
 async def stream_terraform(
-    project_path: Path, command: str
-) -> AsyncGenerator[str, None]:
+    project_path: Path,
+    command: str,
+    *,
+    on_chunk: ChunkCallback | None = None,
+    on_error: ErrorCallback | None = None,
+) -> AsyncGenerator[bytes, None]:
     """
     Stream the output of a terraform command.
+
+    Output is read in chunks of whatever the pipe has available (up to
+    `STREAM_CHUNK_SIZE` bytes), so bursts of lines are sent together while a
+    slow command still streams each line as soon as it is written.
+    Chunks are yielded as the raw bytes from the pipe, ready to be sent as is.
+    Error detection keeps working line by line across chunk boundaries.
+
+    `on_chunk` is called with every chunk before it is yielded, until it
+    returns True. When
+    `on_error` is given, a failed command yields its return value as the last
+    chunk instead of raising the RuntimeError.
     """
     logger.info(f"Executing command: {command} from {project_path}")
     proc = await asyncio.create_subprocess_shell(
@@ -22,36 +79,52 @@ async def stream_terraform(
         stderr=asyncio.subprocess.STDOUT,
     )
 
-    output_lines = []
+    output_chunks = []
     error_detected = False
-    while True:
-        if stdout := proc.stdout:
-            line = await stdout.readline()
-            if not line:
+    pending = b""
+    if stdout := proc.stdout:
+        while True:
+            chunk = await stdout.read(STREAM_CHUNK_SIZE)
+            if not chunk:
                 break
-            decoded_line = line.decode()
-            output_lines.append(decoded_line)
+            output_chunks.append(chunk)
 
-            # Check for "Error:" string in the output
-            if "Error:" in decoded_line:
-                error_detected = True
-                logger.error(
-                    f"Error detected in terraform output: {decoded_line.strip()}"
-                )
+            # Check complete lines for the "Error:" string in the output
+            *lines, pending = (pending + chunk).split(b"\n")
+            for line in lines:
+                if b"Error:" in line:
+                    error_detected = True
+                    logger.error(
+                        f"Error detected in terraform output: {_decode(line).strip()}"
+                    )
 
-            yield decoded_line
-        else:
-            break
+            if on_chunk is not None and on_chunk(chunk):
+                on_chunk = None
+            yield chunk
+
+        if b"Error:" in pending:
+            error_detected = True
+            logger.error(
+                f"Error detected in terraform output: {_decode(pending).strip()}"
+            )
 
     # Wait for the process to complete and check return code
     await proc.wait()
     if proc.returncode != 0 or error_detected:
         logger.error(f"Command failed with exit code {proc.returncode}")
-        error_output = "".join(output_lines)
-        raise RuntimeError(
+        error_output = _decode(b"".join(output_chunks))
+        error = RuntimeError(
             f"Command failed with exit code {proc.returncode}: "
             f"{clean_terraform_errors(error_output)}"
         )
+        if on_error is None:
+            raise error
+        yield on_error(error)
+
+
+def _decode(output: bytes) -> str:
+    """Decode terraform output for logs and error messages."""
+    return output.decode("utf-8", errors="replace")
 
 
 async def _set_workspace(project_path: Path, workspace: str) -> str:
@@ -137,95 +210,119 @@ async def build_var_file(
     return var_file
 
 
-async def stream_terraform_init(
-    project_path: Path, workspace: str
-) -> AsyncGenerator[str, None]:
+async def _stream_workspace_command(
+    project_path: Path,
+    workspace: str,
+    command: str,
+    vars: TerraformVars | None,
+    var_file: Path | None,
+    suffix: str = "",
+    *,
+    on_chunk: ChunkCallback | None = None,
+    on_error: ErrorCallback | None = None,
+) -> AsyncGenerator[bytes, None]:
     """
-    Stream the output of the terraform init command.
+    Select the workspace, add the variable arguments to `command` and stream it.
+
+    Variables take precedence over `var_file`; without either, the workspace
+    var file is used. A workspace selection failure is reported through
+    `on_error` like a failed command.
     """
-    res = await _set_workspace(project_path, workspace)
+    try:
+        res = await _set_workspace(project_path, workspace)
+    except RuntimeError as e:
+        if on_error is None:
+            raise
+        yield on_error(e)
+        return
     logger.info(res)
-    async for line in stream_terraform(project_path, "terraform init"):
-        yield line
+    if vars:
+        for key, value in vars.items():
+            command += f" -var='{key}={value}'"
+    elif var_file:
+        command += f" -var-file={var_file}"
+    else:
+        var_file_from_workspace = await get_var_file(project_path, workspace)
+        command += f" -var-file={var_file_from_workspace}"
+    command += suffix
+    async for chunk in stream_terraform(
+        project_path, command, on_chunk=on_chunk, on_error=on_error
+    ):
+        yield chunk
 
 
-async def stream_terraform_plan(
+def stream_terraform_plan(
     project_path: Path,
     workspace: str,
-    vars: dict[str, str | int | float | bool] | None = None,
+    vars: TerraformVars | None = None,
     var_file: Path | None = None,
     output: Path | None = None,
-) -> AsyncGenerator[str, None]:
+    *,
+    on_chunk: ChunkCallback | None = None,
+    on_error: ErrorCallback | None = None,
+) -> AsyncGenerator[bytes, None]:
     """
     Stream the output of the terraform plan command.
     TODO: Add support for generating a plan file.
     TODO: Generate a var_file from the vars dict for the apply and destroy command.
     """
-    res = await _set_workspace(project_path, workspace)
-    logger.info(res)
-    command = "terraform plan"
-    if vars:
-        for key, value in vars.items():
-            command += f" -var='{key}={value}'"
-    elif var_file:
-        command += f" -var-file={var_file}"
-    else:
-        var_file_from_workspace = await get_var_file(project_path, workspace)
-        command += f" -var-file={var_file_from_workspace}"
-    if output:
-        command += f" -out={output}"
-    async for line in stream_terraform(project_path, command):
-        yield line
+    return _stream_workspace_command(
+        project_path,
+        workspace,
+        "terraform plan",
+        vars,
+        var_file,
+        f" -out={output}" if output else "",
+        on_chunk=on_chunk,
+        on_error=on_error,
+    )
 
 
-async def stream_terraform_apply(
+def stream_terraform_apply(
     project_path: Path,
     workspace: str,
     var_file: Path | None = None,
-    vars: dict[str, str | int | float | bool] | None = None,
+    vars: TerraformVars | None = None,
     input: Path | None = None,
-) -> AsyncGenerator[str, None]:
+    *,
+    on_chunk: ChunkCallback | None = None,
+    on_error: ErrorCallback | None = None,
+) -> AsyncGenerator[bytes, None]:
     """
     Stream the output of the terraform apply command.
     TODO: Add support for applying a plan file.
     """
-    res = await _set_workspace(project_path, workspace)
-    logger.info(res)
-    command = "terraform apply -auto-approve"
-    if vars:
-        for key, value in vars.items():
-            command += f" -var='{key}={value}'"
-    elif var_file:
-        command += f" -var-file={var_file}"
-    else:
-        var_file_from_workspace = await get_var_file(project_path, workspace)
-        command += f" -var-file={var_file_from_workspace}"
-    if input:
-        command += f" {input}"
-    async for line in stream_terraform(project_path, command):
-        yield line
+    return _stream_workspace_command(
+        project_path,
+        workspace,
+        "terraform apply -auto-approve",
+        vars,
+        var_file,
+        f" {input}" if input else "",
+        on_chunk=on_chunk,
+        on_error=on_error,
+    )
 
 
-async def stream_terraform_destroy(
+def stream_terraform_destroy(
     project_path: Path,
     workspace: str,
     var_file: Path | None = None,
-    vars: dict[str, str | int | float | bool] | None = None,
-) -> AsyncGenerator[str, None]:
+    vars: TerraformVars | None = None,
+    *,
+    on_chunk: ChunkCallback | None = None,
+    on_error: ErrorCallback | None = None,
+) -> AsyncGenerator[bytes, None]:
     """
     Stream the output of the terraform destroy command.
     TODO: Should only use the var_file generated by the plan command.
     """
-    res = await _set_workspace(project_path, workspace)
-    logger.info(res)
-    command = "terraform destroy -auto-approve"
-    if vars:
-        for key, value in vars.items():
-            command += f" -var='{key}={value}'"
-    elif var_file:
-        command += f" -var-file={var_file}"
-    else:
-        var_file_from_workspace = await get_var_file(project_path, workspace)
-        command += f" -var-file={var_file_from_workspace}"
-    async for line in stream_terraform(project_path, command):
-        yield line
+    return _stream_workspace_command(
+        project_path,
+        workspace,
+        "terraform destroy -auto-approve",
+        vars,
+        var_file,
+        on_chunk=on_chunk,
+        on_error=on_error,
+    )
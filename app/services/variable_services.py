@@ -1,13 +1,18 @@
 """Service layer for variable management with comprehensive use cases."""
 
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
 
+from sqlalchemy import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.databases.models import Variable, VariableType
 from app.logger import logger
 from app.repositories.variable_repository import VariableRepository
 from app.schemas.variable_schema import VariableCreate, VariableResponse, VariableUpdate
+from app.services.cache import cached
+
+# How long deployment variables are served from the in-process cache.
+DEPLOYMENT_VARIABLES_TTL = 10.0
 
 
 class VariableService:
@@ -34,7 +39,6 @@ class VariableService:
         try:
             await self.session.flush()  # Persist without committing
         except Exception as e:
-            await self.session.rollback()
             logger.error(f"Failed to create variable: {e}")
             raise
 
@@ -72,7 +76,40 @@ class VariableService:
             workspace_name=workspace_name,
             variable_type=variable_type,
         )
-        return [VariableResponse.model_validate(var) for var in variables]
+        return [VariableResponse.from_row(var) for var in variables]
+
+    async def stream_variables_by_project(
+        self,
+        project_name: str,
+        workspace_name: Optional[str] = None,
+        variable_type: VariableType = VariableType.TERRAFORM,
+    ) -> AsyncIterator[VariableResponse]:
+        """Stream all variables for a project and workspace, without paging."""
+        async for var in self.repository.stream_by_project(
+            project_name, workspace_name, variable_type
+        ):
+            yield VariableResponse.from_row(var)
+
+    @cached(
+        ttl=DEPLOYMENT_VARIABLES_TTL,
+        key=lambda self, project_name, workspace_name: (project_name, workspace_name),
+    )
+    async def get_deployment_variables(
+        self, project_name: str, workspace_name: str
+    ) -> List[Row[Tuple[str, Any, str]]]:
+        """
+        Get the variables needed to deploy a workspace: the PROJECT variables
+        shared by the whole project and the workspace's INSTANCE variables,
+        ordered by description so that they can be grouped in one pass, with
+        PROJECT before INSTANCE within a description.
+
+        Only `key`, `value` and `description` are loaded, as rows exposing them
+        as attributes. Results are cached for `DEPLOYMENT_VARIABLES_TTL`
+        seconds; see `invalidate_deployment_variables`.
+        """
+        return await self.repository.list_deployment_variables(
+            project_name, workspace_name
+        )
 
     async def update_variable(
         self, variable_id: int, variable_data: VariableUpdate
@@ -86,7 +123,6 @@ class VariableService:
             logger.info(f"Updated variable ID {variable_id}")
             return variable
         except Exception as e:
-            await self.session.rollback()
             logger.error(f"Failed to update variable ID {variable_id}: {e}")
             raise
 
@@ -98,7 +134,6 @@ class VariableService:
                 logger.info(f"Deleted variable ID {variable_id}")
             return success
         except Exception as e:
-            await self.session.rollback()
             logger.error(f"Failed to delete variable ID {variable_id}: {e}")
             raise
 
@@ -109,12 +144,12 @@ class VariableService:
         project_filter: Optional[str] = None,
         workspace_filter: Optional[str] = None,
         variable_type_filter: Optional[VariableType] = None,
-    ) -> List[VariableResponse]:
-        """List all variables with optional filtering."""
-        variables = await self.repository.list_all(
+    ) -> Tuple[List[VariableResponse], int]:
+        """List all variables with optional filtering, with the total count."""
+        variables, total = await self.repository.list_all_with_total(
             skip, limit, project_filter, workspace_filter, variable_type_filter
         )
-        return [VariableResponse.model_validate(var) for var in variables]
+        return [VariableResponse.from_row(var) for var in variables], total
 
     async def search_variables(
         self,
@@ -139,34 +174,62 @@ class VariableService:
         Bulk import variables with conflict resolution.
 
         Use case: Import variables from a configuration file or another environment.
+
+        New variables are inserted together with one statement. A variable that
+        can't be written is reported in `errors` and the rest are still
+        imported. With `overwrite_existing`, a key repeated within the import
+        is created once and counted as updated by its later entries.
         """
-        created = []
         updated = []
-        errors = []
+        errors: List[str] = []
+        # New variables are inserted together at the end, keyed like the
+        # existing-variable lookup so duplicates within the import are caught
+        to_create: Dict[Tuple[str, str, Optional[str]], VariableCreate] = {}
+        # Later entries overwriting a variable created by this import
+        overwritten = []
 
         for var_data in variables_data:
+            identity = (var_data.key, var_data.project_name, var_data.workspace_name)
             try:
-                existing = await self.repository.get_by_key_and_project(
-                    var_data.key, var_data.project_name, var_data.workspace_name
-                )
+                if identity in to_create:
+                    if overwrite_existing:
+                        to_create[identity] = var_data
+                        overwritten.append(identity)
+                    else:
+                        errors.append(
+                            f"Variable '{var_data.key}' already exists (skipped)"
+                        )
+                    continue
+
+                existing = await self.repository.get_by_key_and_project(*identity)
 
                 if existing and not overwrite_existing:
                     errors.append(f"Variable '{var_data.key}' already exists (skipped)")
                 elif existing and overwrite_existing:
-                    # Update existing variable
+                    # Update existing variable, in a savepoint so that a failed
+                    # update doesn't abort the rest of the import
                     update_data = VariableUpdate(**var_data.model_dump())
-                    variable = await self.repository.update_from_schema(
-                        existing.id, update_data
-                    )
+                    async with self.session.begin_nested():
+                        variable = await self.repository.update_from_schema(
+                            existing.id, update_data
+                        )
                     updated.append(variable)
                 else:
-                    # Create new variable
-                    variable = await self.repository.create_from_schema(var_data)
-                    created.append(variable)
+                    to_create[identity] = var_data
 
             except Exception as e:
                 errors.append(f"Error processing '{var_data.key}': {str(e)}")
 
+        # Create new variables
+        created = await self._bulk_create_variables(list(to_create.values()), errors)
+        created_by_identity = {
+            (var.key, var.project_name, var.workspace_name): var for var in created
+        }
+        updated.extend(
+            created_by_identity[identity]
+            for identity in overwritten
+            if identity in created_by_identity
+        )
         await self.session.flush()  # Ensure all changes are saved
         logger.info(
             f"Bulk import completed: {len(created)} created, {len(updated)} updated, "
@@ -181,6 +244,37 @@ class VariableService:
             "updated_variables": updated,
         }
 
+    async def _bulk_create_variables(
+        self, variables_data: List[VariableCreate], errors: List[str]
+    ) -> List[Variable]:
+        """
+        Insert new variables with a single statement.
+
+        If that fails (e.g. a key inserted concurrently), the variables are
+        inserted one at a time instead, and only those that fail are reported
+        in `errors`. Each insert runs in a savepoint, so a failure leaves the
+        surrounding transaction usable.
+        """
+        if not variables_data:
+            return []
+        try:
+            async with self.session.begin_nested():
+                return await self.repository.bulk_create(variables_data)
+        except Exception as e:
+            logger.warning(
+                f"Bulk insert of {len(variables_data)} variables failed, "
+                f"inserting them one at a time: {e}"
+            )
+
+        created = []
+        for var_data in variables_data:
+            try:
+                async with self.session.begin_nested():
+                    created.extend(await self.repository.bulk_create([var_data]))
+            except Exception as e:
+                errors.append(f"Error processing '{var_data.key}': {str(e)}")
+        return created
+
     async def clone_workspace_variables(
         self,
         source_project: str,
@@ -286,7 +380,7 @@ class VariableService:
         self,
         project_name: str,
         workspace_name: Optional[str] = None,
-        required_variables: Optional[List[str]] = None,
+        required_variables: Optional[Sequence[str]] = None,
     ) -> Dict[str, Any]:
         """
         Validate that all required variables are defined.
@@ -294,17 +388,16 @@ class VariableService:
         Use case: Check if all required variables are set before Terraform operations.
         """
         if not required_variables:
-            required_variables = []
+            required_variables = ()
 
         existing_variables = await self.repository.list_by_project(
             project_name, workspace_name=workspace_name
         )
         existing_keys = {var.key for var in existing_variables}
 
-        missing_variables = set(required_variables) - existing_keys
-        extra_variables = (
-            existing_keys - set(required_variables) if required_variables else set()
-        )
+        required_keys = set(required_variables)
+        missing_variables = required_keys - existing_keys
+        extra_variables = existing_keys - required_keys if required_keys else set()
 
         sensitive_count = sum(1 for var in existing_variables if var.is_sensitive)
 
@@ -323,43 +416,34 @@ class VariableService:
 
         Use case: Dashboard or monitoring information.
         """
-        all_variables = await self.repository.list_all(limit=10000)  # Get all variables
-
-        stats: Dict[str, Any] = {
-            "total_variables": len(all_variables),
-            "projects": len(set(var.project_name for var in all_variables)),
-            "workspaces": len(
-                set(var.workspace_name for var in all_variables if var.workspace_name)
-            ),
-            "sensitive_variables": sum(1 for var in all_variables if var.is_sensitive),
-            "variable_types": {},
-            "variables_by_project": {},
-            "variables_by_workspace": {},
-        }
-
-        # Count by variable type
-        for var in all_variables:
-            var_type = var.variable_type
-            stats["variable_types"][var_type] = (
-                stats["variable_types"].get(var_type, 0) + 1
-            )
-
-        # Count by project
-        for var in all_variables:
-            project = var.project_name
-            stats["variables_by_project"][project] = (
-                stats["variables_by_project"].get(project, 0) + 1
-            )
+        # The database does the counting; only one row per group is returned
+        groups = await self.repository.count_by_group()
+
+        variable_types: Dict[Any, int] = {}
+        variables_by_project: Dict[str, int] = {}
+        variables_by_workspace: Dict[str, int] = {}
+        workspaces = set()
+        total = sensitive = 0
+
+        for project, workspace, var_type, count, sensitive_count in groups:
+            total += count
+            sensitive += sensitive_count
+            variable_types[var_type] = variable_types.get(var_type, 0) + count
+            variables_by_project[project] = variables_by_project.get(project, 0) + count
+            if workspace:
+                workspaces.add(workspace)
+                key = f"{project}/{workspace}"
+                variables_by_workspace[key] = variables_by_workspace.get(key, 0) + count
 
-        # Count by workspace
-        for var in all_variables:
-            if var.workspace_name:
-                workspace = f"{var.project_name}/{var.workspace_name}"
-                stats["variables_by_workspace"][workspace] = (
-                    stats["variables_by_workspace"].get(workspace, 0) + 1
-                )
-
-        return stats
+        return {
+            "total_variables": total,
+            "projects": len(variables_by_project),
+            "workspaces": len(workspaces),
+            "sensitive_variables": sensitive,
+            "variable_types": variable_types,
+            "variables_by_project": variables_by_project,
+            "variables_by_workspace": variables_by_workspace,
+        }
 
     async def import_variables_from_shell_script(
         self,
@@ -463,29 +547,33 @@ class VariableService:
             stats["parsed_variables"] += 1  # type: ignore
 
             try:
-                variable_create = VariableCreate(
-                    key=var_data["key"],
-                    value=var_data["value"],
-                    description=var_data["description"],
-                    variable_type=variable_type,
-                    is_sensitive=var_data["is_sensitive"],
-                    project_name=project_name,
-                    workspace_name=workspace_name,
-                )
-
-                existing_var = await self.repository.get_by_key_and_project(
-                    var_data["key"], project_name, workspace_name
-                )
-
-                if existing_var:
-                    if overwrite_existing:
-                        await self._update_existing_variable(
-                            existing_var, variable_create, stats
-                        )
+                # Each variable is written in its own savepoint: a failed one
+                # is rolled back alone, and the import goes on in the
+                # request's transaction
+                async with self.session.begin_nested():
+                    variable_create = VariableCreate(
+                        key=var_data["key"],
+                        value=var_data["value"],
+                        description=var_data["description"],
+                        variable_type=variable_type,
+                        is_sensitive=var_data["is_sensitive"],
+                        project_name=project_name,
+                        workspace_name=workspace_name,
+                    )
+
+                    existing_var = await self.repository.get_by_key_and_project(
+                        var_data["key"], project_name, workspace_name
+                    )
+
+                    if existing_var:
+                        if overwrite_existing:
+                            await self._update_existing_variable(
+                                existing_var, variable_create, stats
+                            )
+                        else:
+                            stats["skipped"] += 1  # type: ignore
                     else:
-                        stats["skipped"] += 1  # type: ignore
-                else:
-                    await self._create_new_variable(variable_create, stats)
+                        await self._create_new_variable(variable_create, stats)
 
             except Exception as e:
                 stats["errors"].append(f"Line {var_data['line_num']}: {str(e)}")  # type: ignore
@@ -563,3 +651,8 @@ class VariableService:
         ]
         key_lower = key.lower()
         return any(keyword in key_lower for keyword in sensitive_keywords)
+
+
+def invalidate_deployment_variables() -> None:
+    """Drop all cached deployment variables, e.g. after variables changed."""
+    VariableService.get_deployment_variables.cache.clear()  # type: ignore[attr-defined]
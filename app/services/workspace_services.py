@@ -4,10 +4,14 @@ from pathlib import Path
 from app.exceptions.exceptions import TerraformNotInitializedError
 from app.logger import logger
 from app.schemas import WorkspaceOutput
+from app.services.cache import cached
 from app.services.project_services import check_project_exists, get_project
 from app.services.terraform_services import execute_terraform_command
 from app.var_type import TFVars
 
+# How long an existing workspace is remembered by `check_workspace_exists`.
+WORKSPACE_CHECK_TTL = 2.0
+
 
 async def activate_workspace(project_name: str, workspace: str) -> WorkspaceOutput:
     """
@@ -18,7 +22,7 @@ async def activate_workspace(project_name: str, workspace: str) -> WorkspaceOutp
         f"terraform workspace select {workspace}",
     )
     logger.info(res)
-    return WorkspaceOutput(name=workspace, active=True)
+    return WorkspaceOutput.model_construct(name=workspace, active=True)
 
 
 async def get_workspaces(project_name: str) -> list[WorkspaceOutput]:
@@ -34,7 +38,7 @@ async def get_workspaces(project_name: str) -> list[WorkspaceOutput]:
     # and set active to False for the rest
 
     return [
-        WorkspaceOutput(
+        WorkspaceOutput.model_construct(
             name=wk[2:] if wk.startswith("*") else wk.strip(), active=wk.startswith("*")
         )
         for wk in wks
@@ -49,7 +53,8 @@ async def create_workspace(project_name: str, workspace: str) -> WorkspaceOutput
         Path(f"infra/{project_name}/infra/terraform"),
         f"terraform workspace new {workspace}",
     )
-    return WorkspaceOutput(name=workspace, active=True)
+    invalidate_workspace_check(project_name, workspace)
+    return WorkspaceOutput.model_construct(name=workspace, active=True)
 
 
 async def check_project_initialized(project_name: str) -> None:
@@ -65,9 +70,17 @@ async def check_project_initialized(project_name: str) -> None:
         raise TerraformNotInitializedError(str(err)) from err
 
 
+@cached(
+    ttl=WORKSPACE_CHECK_TTL,
+    key=lambda project_name, workspace: (project_name, workspace),
+)
 async def check_workspace_exists(project_name: str, workspace: str) -> None:
     """
     Check if the workspace exists for a given project.
+
+    Listing workspaces runs terraform, so an existing workspace is remembered
+    for `WORKSPACE_CHECK_TTL` seconds. Missing workspaces raise and are not
+    remembered.
     """
     await check_project_exists(project_name)
     workspaces = [wk.name for wk in await get_workspaces(project_name)]
@@ -77,6 +90,13 @@ async def check_workspace_exists(project_name: str, workspace: str) -> None:
         )
 
 
+def invalidate_workspace_check(project_name: str, workspace: str) -> None:
+    """Forget the cached `check_workspace_exists` result for a workspace."""
+    check_workspace_exists.cache.invalidate(  # type: ignore[attr-defined]
+        (project_name, workspace)
+    )
+
+
 async def delete_workspace(project_name: str, workspace: str) -> None:
     """
     Delete a terraform workspace for a given project.
@@ -94,6 +114,7 @@ async def delete_workspace(project_name: str, workspace: str) -> None:
         f"terraform workspace delete {workspace}",
     )
     logger.info(res)
+    invalidate_workspace_check(project_name, workspace)
     logger.info(f"Workspace {workspace} deleted successfully.")
 
 
@@ -106,16 +127,19 @@ async def get_workspace_tfvars(project_name: str, workspace: str) -> TFVars:
     tfvars_path = project_path / "infra/terraform/tfvars.d"
     workspace_file = tfvars_path / f"{workspace}.tfvars.json"
 
-    if not workspace_file.exists():
+    # Open the file directly rather than checking that it exists first, which
+    # would cost an extra stat on every read
+    try:
+        with open(workspace_file, "r") as f:
+            data = json.load(f)
+    except FileNotFoundError:
         return TFVars()
 
-    with open(workspace_file, "r") as f:
-        data = json.load(f)
-        # Ensure the loaded data is a dictionary
-        if not isinstance(data, dict):
-            return TFVars()
+    # Ensure the loaded data is a dictionary
+    if not isinstance(data, dict):
+        return TFVars()
 
-        return TFVars.from_dict(data)
+    return TFVars.from_dict(data)
 
 
 async def create_workspace_tfvars(
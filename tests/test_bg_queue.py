@@ -0,0 +1,80 @@
+from unittest.mock import patch
+
+import anyio
+import pytest
+
+from app.services.bg_queue import BackgroundQueue
+
+
+class TestBackgroundQueue:
+    @pytest.mark.anyio
+    async def test_jobs_run_and_drain_on_stop(self):
+        # Arrange
+        queue = BackgroundQueue(worker_count=2)
+        done = []
+
+        async def job(n):
+            done.append(n)
+
+        await queue.start()
+
+        # Act
+        for n in range(5):
+            queue.submit(lambda n=n: job(n))
+        await queue.stop()
+
+        # Assert
+        assert sorted(done) == [0, 1, 2, 3, 4]
+
+    @pytest.mark.anyio
+    async def test_failing_job_does_not_stop_worker(self):
+        # Arrange
+        queue = BackgroundQueue(worker_count=1)
+        done = []
+
+        async def failing():
+            raise ValueError("boom")
+
+        async def ok():
+            done.append(True)
+
+        await queue.start()
+
+        # Act
+        queue.submit(failing)
+        queue.submit(ok)
+        await queue.stop()
+
+        # Assert
+        assert done == [True]
+
+    def test_submit_before_start_drops_job(self):
+        # Arrange
+        queue = BackgroundQueue()
+
+        # Act
+        submitted = queue.submit(lambda: None)
+
+        # Assert
+        assert submitted is False
+
+    @pytest.mark.anyio
+    async def test_stop_cancels_jobs_past_drain_timeout(self):
+        # Arrange
+        queue = BackgroundQueue(worker_count=1)
+        done = []
+
+        async def slow():
+            await anyio.sleep(10)
+            done.append(True)
+
+        await queue.start()
+        queue.submit(slow)
+
+        # Act
+        with patch("app.services.bg_queue.DRAIN_TIMEOUT", 0.01):
+            await queue.stop()
+
+        # Assert
+        assert done == []
+        assert queue.submit(slow) is False
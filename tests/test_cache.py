@@ -0,0 +1,86 @@
+from unittest.mock import patch
+
+import pytest
+
+from app.services.cache import TTLCache, cached
+
+
+class TestTTLCache:
+    def test_get_returns_value_until_expired(self):
+        # Arrange
+        cache = TTLCache(ttl=5)
+
+        # Act & Assert
+        with patch("app.services.cache.time.monotonic", return_value=100.0):
+            cache.set("key", "value")
+            assert cache.get("key") == "value"
+        with patch("app.services.cache.time.monotonic", return_value=105.0):
+            assert cache.get("key") is None
+
+    def test_evicts_oldest_entry_when_full(self):
+        # Arrange
+        cache = TTLCache(ttl=60, maxsize=2)
+
+        # Act
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.set("c", 3)
+
+        # Assert
+        assert cache.get("a") is None
+        assert cache.get("b") == 2
+        assert cache.get("c") == 3
+
+    def test_invalidate_and_clear(self):
+        # Arrange
+        cache = TTLCache(ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+
+        # Act & Assert
+        cache.invalidate("a")
+        assert cache.get("a") is None
+        assert cache.get("b") == 2
+        cache.clear()
+        assert cache.get("b") is None
+
+
+class TestCached:
+    @pytest.mark.anyio
+    async def test_repeated_calls_are_served_from_cache(self):
+        # Arrange
+        calls = []
+
+        @cached(ttl=60)
+        async def fetch(name):
+            calls.append(name)
+            return name.upper()
+
+        # Act
+        first = await fetch("a")
+        second = await fetch("a")
+        other = await fetch("b")
+
+        # Assert
+        assert first == second == "A"
+        assert other == "B"
+        assert calls == ["a", "b"]
+
+    @pytest.mark.anyio
+    async def test_custom_key_and_cache_clear(self):
+        # Arrange
+        calls = []
+
+        @cached(ttl=60, key=lambda owner, name: name)
+        async def fetch(owner, name):
+            calls.append(owner)
+            return name
+
+        # Act
+        await fetch("first", "a")
+        await fetch("second", "a")
+        fetch.cache.clear()
+        await fetch("third", "a")
+
+        # Assert
+        assert calls == ["first", "third"]
@@ -0,0 +1,52 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.error_handlers import register_exception_handlers
+from app.exceptions.exceptions import EntityNotFoundError
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    register_exception_handlers(app)
+
+    @app.get("/missing")
+    async def missing():
+        raise EntityNotFoundError("Widget not found.")
+
+    @app.get("/boom")
+    async def boom():
+        raise ValueError("boom")
+
+    @app.get("/missing-file")
+    async def missing_file():
+        raise FileNotFoundError("/srv/4clicks/keys/id_ed25519 does not exist")
+
+    return TestClient(app, raise_server_exceptions=False)
+
+
+class TestExceptionHandlers:
+    def test_app_exception_mapped_to_status_code(self, client):
+        # Act
+        response = client.get("/missing")
+
+        # Assert
+        assert response.status_code == 404
+        assert response.json() == {"detail": "Widget not found."}
+
+    def test_unexpected_exception_mapped_to_500(self, client):
+        # Act
+        response = client.get("/boom")
+
+        # Assert
+        assert response.status_code == 500
+        assert response.json() == {"detail": "Internal server error"}
+
+    def test_file_not_found_does_not_leak_path(self, client):
+        # Act
+        response = client.get("/missing-file")
+
+        # Assert
+        assert response.status_code == 500
+        assert response.json() == {"detail": "Internal server error"}
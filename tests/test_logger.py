@@ -0,0 +1,14 @@
+import logging
+
+from app.logger import _log_level
+
+
+class TestLogLevel:
+    def test_known_level_in_any_case(self):
+        # Act & Assert
+        assert _log_level("info") == logging.INFO
+        assert _log_level("WARNING") == logging.WARNING
+
+    def test_unknown_level(self):
+        # Act & Assert
+        assert _log_level("verbose") is None
@@ -4,15 +4,17 @@ import pytest
 from fastapi import FastAPI, HTTPException
 from fastapi.testclient import TestClient
 
+from app.api.error_handlers import register_exception_handlers
 from app.api.v1.params import ProjectParams
 from app.api.v1.projects import get_projects, init_project, get_project, router
-from app.exceptions.exceptions import TerraformInitError
+from app.exceptions.exceptions import EntityNotFoundError, TerraformInitError
 from app.schemas import ProjectListResponse, ProjectOutput, ProjectDetailResponse
 
 
 @pytest.fixture
 def client():
     app = FastAPI()
+    register_exception_handlers(app)
     app.include_router(router)
     return TestClient(app)
 
@@ -67,6 +69,23 @@ class TestGetProjects:
         assert data["projects"][0]["name"] == "test-project"
 
 
+    def test_get_projects_endpoint_etag(self, client):
+        # Arrange & Act
+        with patch("app.services.project_services.get_projects", new_callable=AsyncMock) as mock_get_projects:
+            mock_get_projects.return_value = [
+                ProjectOutput(name="test-project", description="Test description")
+            ]
+            response = client.get("/projects/")
+            cached = client.get("/projects/", headers={"If-None-Match": response.headers["ETag"]})
+
+        # Assert
+        assert response.status_code == 200
+        assert response.headers["Cache-Control"] == "private, max-age=5"
+        assert cached.status_code == 304
+        assert cached.content == b""
+        assert cached.headers["ETag"] == response.headers["ETag"]
+
+
 class TestGetProject:
     @pytest.mark.anyio
     @patch("app.services.project_services.get_project", new_callable=AsyncMock)
@@ -188,6 +207,29 @@ class TestGetProject:
         assert data["project"]["name"] == "test-project"
         assert data["tfvars"] == {}
 
+class TestGetProjectVariablesForm:
+    def test_get_project_variables_form_endpoint_project_not_found(self, client):
+        # Arrange & Act
+        with patch("app.services.project_services.check_project_exists", new_callable=AsyncMock) as mock_check_exists:
+            mock_check_exists.side_effect = FileNotFoundError("Path infra/non-existent does not exist.")
+            response = client.get("/projects/non-existent/variablesForm")
+
+        # Assert
+        assert response.status_code == 404
+        assert response.json() == {"detail": "Project non-existent not found."}
+
+    def test_get_project_variables_form_endpoint_variables_file_missing(self, client):
+        # Arrange & Act
+        with patch("app.services.project_services.check_project_exists", new_callable=AsyncMock), \
+             patch("app.services.project_services.get_project_variables_form", new_callable=AsyncMock) as mock_get_form:
+            mock_get_form.side_effect = FileNotFoundError("Variables file not found for project test-project")
+            response = client.get("/projects/test-project/variablesForm")
+
+        # Assert
+        assert response.status_code == 404
+        assert response.json() == {"detail": "Variables file not found for project test-project."}
+
+
 class TestInitProject:
     @pytest.mark.anyio
     @patch("app.services.project_services.check_project_exists", new_callable=AsyncMock)
@@ -222,16 +264,13 @@ class TestInitProject:
         mock_check_exists.side_effect = FileNotFoundError("Project does not exist")
         
         # Act & Assert
-        with pytest.raises(HTTPException) as exc_info:
+        with pytest.raises(EntityNotFoundError, match="Project non-existent-project not found."):
             await init_project(
                 reconfigure=False,
                 upgrade=False,
                 migrate_state=False,
                 params=params,
             )
-        
-        assert exc_info.value.status_code == 404
-        assert "Project does not exist" in str(exc_info.value.detail)
 
     @pytest.mark.anyio
     @patch("app.services.project_services.check_project_exists", new_callable=AsyncMock)
@@ -241,16 +280,13 @@ class TestInitProject:
         mock_check_exists.side_effect = NotADirectoryError("Project is not a directory")
         
         # Act & Assert
-        with pytest.raises(HTTPException) as exc_info:
+        with pytest.raises(EntityNotFoundError, match="Project not-a-directory not found."):
             await init_project(
                 reconfigure=False,
                 upgrade=False,
                 migrate_state=False,
                 params=params,
             )
-        
-        assert exc_info.value.status_code == 404
-        assert "Project is not a directory" in str(exc_info.value.detail)
 
     @pytest.mark.anyio
     @patch("app.services.project_services.check_project_exists", new_callable=AsyncMock)
@@ -261,7 +297,7 @@ class TestInitProject:
         mock_init_project.side_effect = TerraformInitError("Terraform initialization failed")
         
         # Act & Assert
-        with pytest.raises(HTTPException) as exc_info:
+        with pytest.raises(TerraformInitError) as exc_info:
             await init_project(
                 reconfigure=False,
                 upgrade=False,
@@ -270,7 +306,7 @@ class TestInitProject:
             )
         
         assert exc_info.value.status_code == 400
-        assert "Terraform initialization failed" in str(exc_info.value.detail)
+        assert "Terraform initialization failed" in exc_info.value.message
 
     def test_init_project_endpoint_success(self, client):
         # Arrange & Act
@@ -285,12 +321,12 @@ class TestInitProject:
     def test_init_project_endpoint_not_found(self, client):
         # Arrange & Act
         with patch("app.services.project_services.check_project_exists", new_callable=AsyncMock) as mock_check_exists:
-            mock_check_exists.side_effect = FileNotFoundError("Project does not exist")
+            mock_check_exists.side_effect = FileNotFoundError("Path infra/non-existent does not exist.")
             response = client.post("/projects/non-existent/init")
         
         # Assert
         assert response.status_code == 404
-        assert "Project does not exist" in response.json()["detail"]
+        assert response.json() == {"detail": "Project non-existent not found."}
 
     def test_init_project_endpoint_terraform_error(self, client):
         # Arrange & Act
@@ -302,6 +338,7 @@ class TestInitProject:
         # Assert
         assert response.status_code == 400
         assert "Init failed" in response.json()["detail"]
+        assert "reconfigure, upgrade, or migrate_state" in response.json()["detail"]
 
     def test_init_project_invalid_project_name(self, client):
         # Arrange & Act
@@ -309,3 +346,15 @@ class TestInitProject:
         
         # Assert
         assert response.status_code == 422  # Validation error
+        error = response.json()["detail"][0]
+        assert error["type"] == "string_pattern_mismatch"
+        assert error["loc"] == ["path", "project"]
+
+    def test_project_name_pattern_is_documented(self, client):
+        # Arrange & Act
+        schema = client.get("/openapi.json").json()
+
+        # Assert
+        parameters = schema["paths"]["/projects/{project}/init"]["post"]["parameters"]
+        project = next(param for param in parameters if param["name"] == "project")
+        assert project["schema"]["pattern"] == "^[A-Za-z0-9_-]+$"
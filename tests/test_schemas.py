@@ -0,0 +1,143 @@
+from datetime import datetime, timezone
+
+import pytest
+from pydantic import field_validator
+
+from app.databases.models import (
+    SSHKeyPair,
+    SSHKeyType,
+    Task,
+    TaskStatus,
+    TaskTemplate,
+    TaskTemplateType,
+    Variable,
+    VariableType,
+)
+from app.schemas.common_schema import OrmResponse
+from app.schemas.task_schema import (
+    SSHKeyPairResponse,
+    TaskResponse,
+    TaskTemplateResponse,
+)
+from app.schemas.variable_schema import VariableResponse
+
+NOW = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def template_row():
+    return TaskTemplate(
+        id=1,
+        name="deploy",
+        description=None,
+        template_type=TaskTemplateType.ANSIBLE,
+        file_path="deploy.yml",
+        project_name="aws",
+        parameters_schema={"type": "object"},
+        is_active=True,
+        created_at=NOW,
+        updated_at=NOW,
+    )
+
+
+def ssh_key_row():
+    return SSHKeyPair(
+        id=2,
+        name="deploy-key",
+        description="Deploy key",
+        key_type=SSHKeyType.ED25519,
+        key_size=None,
+        fingerprint="SHA256:abc",
+        private_key_encrypted="secret",
+        public_key="ssh-ed25519 AAAA",
+        project_name="aws",
+        is_active=True,
+        last_used_at=None,
+        passphrase_hint=None,
+        created_at=NOW,
+        updated_at=NOW,
+    )
+
+
+def task_row(ssh_key):
+    return Task(
+        id=3,
+        name="run",
+        description=None,
+        status=TaskStatus.COMPLETED,
+        parameters={"limit": 1},
+        logs="ok",
+        exit_code=0,
+        started_at=NOW,
+        completed_at=NOW,
+        project_name="aws",
+        workspace_name="dev",
+        template_id=1,
+        template=template_row(),
+        ssh_key_id=2 if ssh_key else None,
+        ssh_key=ssh_key_row() if ssh_key else None,
+        created_at=NOW,
+        updated_at=NOW,
+    )
+
+
+def variable_row():
+    return Variable(
+        id=4,
+        key="region",
+        value={"name": "eu-west-3"},
+        description=None,
+        variable_type=VariableType.PROJECT,
+        is_sensitive=False,
+        project_name="aws",
+        workspace_name=None,
+        created_at=NOW,
+        updated_at=NOW,
+    )
+
+
+class TestOrmResponse:
+    @pytest.mark.parametrize(
+        "schema, row",
+        [
+            (TaskTemplateResponse, template_row()),
+            (SSHKeyPairResponse, ssh_key_row()),
+            (TaskResponse, task_row(ssh_key=True)),
+            (TaskResponse, task_row(ssh_key=False)),
+            (VariableResponse, variable_row()),
+        ],
+    )
+    def test_from_row_matches_validation(self, schema, row):
+        # Act
+        constructed = schema.from_row(row)
+        validated = schema.model_validate(row)
+
+        # Assert
+        assert constructed.model_dump_json() == validated.model_dump_json()
+
+    def test_every_subclass_is_covered(self):
+        # Arrange
+        subclasses = {
+            schema
+            for schema in OrmResponse.__subclasses__()
+            if schema.__module__.startswith("app.")
+        }
+
+        # Assert
+        assert subclasses == {
+            TaskTemplateResponse,
+            SSHKeyPairResponse,
+            TaskResponse,
+            VariableResponse,
+        }
+
+    def test_subclass_with_validator_is_rejected(self):
+        # Act & Assert
+        with pytest.raises(TypeError, match="validators"):
+
+            class ValidatedResponse(OrmResponse):
+                name: str
+
+                @field_validator("name")
+                @classmethod
+                def strip(cls, value: str) -> str:
+                    return value.strip()
@@ -0,0 +1,64 @@
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.v1.ssh_keys import get_ssh_key_service, router
+from app.databases.models import SSHKeyType
+from app.schemas.task_schema import SSHKeyPairListResponse, SSHKeyPairResponse
+
+NOW = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+SSH_KEY = SSHKeyPairResponse(
+    id=1,
+    name="deploy-key",
+    description=None,
+    project_name="aws",
+    passphrase_hint=None,
+    key_type=SSHKeyType.ED25519,
+    key_size=None,
+    fingerprint="SHA256:abc",
+    public_key="ssh-ed25519 AAAA",
+    is_active=True,
+    created_at=NOW,
+    updated_at=NOW,
+    last_used_at=None,
+)
+
+
+@pytest.fixture
+def service():
+    service = MagicMock()
+    service.list_keys_by_project = AsyncMock(
+        return_value=SSHKeyPairListResponse(ssh_keys=[SSH_KEY], total=1)
+    )
+    return service
+
+
+@pytest.fixture
+def client(service):
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_ssh_key_service] = lambda: service
+    return TestClient(app)
+
+
+class TestListSSHKeys:
+    def test_returns_keys(self, client, service):
+        # Act
+        response = client.get(
+            "/ssh-keys", params={"project_name": "aws", "active_only": False}
+        )
+
+        # Assert
+        assert response.status_code == 200
+        assert response.json() == {
+            "ssh_keys": [SSH_KEY.model_dump(mode="json")],
+            "total": 1,
+        }
+        assert "private_key" not in response.text
+        service.list_keys_by_project.assert_awaited_once_with(
+            "aws", skip=0, limit=100, active_only=False
+        )
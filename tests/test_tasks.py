@@ -0,0 +1,147 @@
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.v1.tasks import (
+    get_task_execution_service,
+    get_task_template_service,
+    router,
+)
+from app.databases.models import TaskStatus, TaskTemplateType
+from app.schemas.task_schema import (
+    TaskResponse,
+    TaskTemplateListResponse,
+    TaskTemplateResponse,
+)
+
+NOW = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+TEMPLATE = TaskTemplateResponse(
+    id=1,
+    name="deploy",
+    description=None,
+    template_type=TaskTemplateType.ANSIBLE,
+    file_path="deploy.yml",
+    project_name="aws",
+    parameters_schema=None,
+    is_active=True,
+    created_at=NOW,
+    updated_at=NOW,
+)
+
+TASK = TaskResponse(
+    id=2,
+    name="run",
+    description=None,
+    parameters={"limit": 1},
+    project_name="aws",
+    workspace_name="dev",
+    status=TaskStatus.COMPLETED,
+    logs="ok",
+    exit_code=0,
+    started_at=NOW,
+    completed_at=NOW,
+    created_at=NOW,
+    updated_at=NOW,
+    template_id=1,
+    template=TEMPLATE,
+    ssh_key_id=None,
+    ssh_key=None,
+)
+
+
+@pytest.fixture
+def template_service():
+    service = MagicMock()
+    service.list_all_templates = AsyncMock(
+        return_value=TaskTemplateListResponse(templates=[TEMPLATE], total=1)
+    )
+    return service
+
+
+@pytest.fixture
+def execution_service():
+    service = MagicMock()
+    service.list_tasks_by_project_paginated = AsyncMock(return_value=([TASK], 1))
+    return service
+
+
+@pytest.fixture
+def client(template_service, execution_service):
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_task_template_service] = lambda: template_service
+    app.dependency_overrides[get_task_execution_service] = lambda: execution_service
+    return TestClient(app)
+
+
+class TestListTaskTemplates:
+    def test_returns_templates_with_etag(self, client):
+        # Act
+        response = client.get("/tasks/templates")
+
+        # Assert
+        assert response.status_code == 200
+        assert response.json() == {
+            "templates": [TEMPLATE.model_dump(mode="json")],
+            "total": 1,
+        }
+        assert response.headers["ETag"]
+        assert response.headers["Cache-Control"] == "private, max-age=5"
+
+    def test_matching_etag_returns_not_modified(self, client):
+        # Arrange
+        etag = client.get("/tasks/templates").headers["ETag"]
+
+        # Act
+        response = client.get("/tasks/templates", headers={"If-None-Match": etag})
+
+        # Assert
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["ETag"] == etag
+
+    def test_stale_etag_returns_body(self, client):
+        # Act
+        response = client.get("/tasks/templates", headers={"If-None-Match": '"stale"'})
+
+        # Assert
+        assert response.status_code == 200
+        assert response.json()["total"] == 1
+
+
+class TestListProjectTaskExecutions:
+    def test_returns_execution_page(self, client, execution_service):
+        # Act
+        response = client.get(
+            "/tasks/projects/aws/executions",
+            params={"workspace_name": "dev", "skip": 0, "limit": 10},
+        )
+
+        # Assert
+        assert response.status_code == 200
+        assert response.json() == {
+            "tasks": [TASK.model_dump(mode="json")],
+            "total": 1,
+            "skip": 0,
+            "limit": 10,
+        }
+        execution_service.list_tasks_by_project_paginated.assert_awaited_once_with(
+            "aws", workspace_name="dev", skip=0, limit=10
+        )
+        # Not a cacheable route
+        assert "ETag" not in response.headers
+
+    def test_page_is_documented_as_response_model(self, client):
+        # Act
+        schema = client.get("/openapi.json").json()
+
+        # Assert
+        operation = schema["paths"]["/tasks/projects/{project_name}/executions"]
+        content = operation["get"]["responses"]["200"]["content"]
+        assert content["application/json"]["schema"] == {
+            "$ref": "#/components/schemas/TaskExecutionPage"
+        }
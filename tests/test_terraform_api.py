@@ -1,173 +1,212 @@
 """
 Tests for terraform API endpoints.
 """
-import asyncio
-from pathlib import Path
-from unittest.mock import AsyncMock, patch, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
+import httpx
 import pytest
 from fastapi import FastAPI
-from fastapi.testclient import TestClient
-from httpx import AsyncClient
 
+from app.api.error_handlers import register_exception_handlers
 from app.api.v1.terraforms import router
+from app.api.v1.variables import get_variable_service
+from app.exceptions.exceptions import ServiceError
 
 
 @pytest.fixture
-def client():
-    """Create a test client for the FastAPI app."""
+def app():
+    """Create the FastAPI app, with the variable service replaced by a mock."""
     app = FastAPI()
+    register_exception_handlers(app)
     app.include_router(router)
-    return TestClient(app)
-
-
-class MockAsyncGenerator:
-    """Mock async generator for testing streaming responses."""
-    
-    def __init__(self, items, raise_error_after=None):
-        self.items = items
-        self.raise_error_after = raise_error_after
-        self.yielded_count = 0
-    
-    def __aiter__(self):
-        return self
-    
-    async def __anext__(self):
-        if self.yielded_count >= len(self.items):
-            raise StopAsyncIteration
-        
-        if self.raise_error_after is not None and self.yielded_count >= self.raise_error_after:
-            raise RuntimeError("Terraform error detected in stream")
-        
-        item = self.items[self.yielded_count]
-        self.yielded_count += 1
-        return item
-
-
-@pytest.mark.asyncio
+    app.dependency_overrides[get_variable_service] = lambda: MagicMock()
+    return app
+
+
+@pytest.fixture
+async def client(app):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+        yield ac
+
+
+def fake_stream(chunks, error=None):
+    """
+    Stand-in for the terraform stream functions.
+
+    Passes each chunk to the route's `on_chunk` callback and yields it, then,
+    like a failed command, what the `on_error` callback returns for `error`.
+    """
+
+    def stream(*args, on_chunk=None, on_error=None, **kwargs):
+        async def generate():
+            for chunk in chunks:
+                if on_chunk is not None:
+                    on_chunk(chunk)
+                yield chunk
+            if error is not None:
+                yield on_error(RuntimeError(error))
+
+        return generate()
+
+    return MagicMock(side_effect=stream)
+
+
 class TestTerraformPlanAPI:
     """Tests for the /plan endpoint."""
 
-    @patch("app.api.v1.terraforms.stream_terraform_plan")
-    @patch("app.api.v1.terraforms.get_var_file")
-    @patch("app.api.v1.terraforms.get_db_session")
-    async def test_plan_successful_stream(self, mock_db, mock_get_var_file, mock_stream_plan):
+    @pytest.mark.anyio
+    @patch("app.api.v1.terraforms.build_var_file", new_callable=AsyncMock)
+    async def test_plan_successful_stream(self, mock_build_var_file, client):
         """Test successful terraform plan streaming."""
-        # Mock the var file to exist
-        mock_get_var_file.return_value = Path("/test/tfvars.d/test.tfvars.json")
-        
-        # Mock successful streaming
-        mock_stream_plan.return_value = MockAsyncGenerator([
-            "Initializing the backend...\n",
-            "Terraform will perform the following actions:\n",
-            "Plan: 1 to add, 0 to change, 0 to destroy.\n"
+        stream = fake_stream([
+            b"Initializing the backend...\n",
+            b"Terraform will perform the following actions:\n",
+            b"Plan: 1 to add, 0 to change, 0 to destroy.\n",
         ])
-        
-        async with AsyncClient(app=app, base_url="http://test") as ac:
-            response = await ac.post("/projects/test-project/workspaces/test/plan")
-        
+
+        with patch("app.api.v1.terraforms.stream_terraform_plan", stream):
+            response = await client.post("/projects/test-project/workspaces/test/plan")
+
         assert response.status_code == 200
         assert "Initializing the backend" in response.text
         assert "Plan: 1 to add" in response.text
+        mock_build_var_file.assert_awaited_once()
+        assert stream.call_args.args[1] == "test"
 
-    @patch("app.api.v1.terraforms.stream_terraform_plan")
-    @patch("app.api.v1.terraforms.get_var_file")
-    @patch("app.api.v1.terraforms.get_db_session")
-    async def test_plan_with_error_in_stream(self, mock_db, mock_get_var_file, mock_stream_plan):
+    @pytest.mark.anyio
+    @patch("app.api.v1.terraforms.build_var_file", new_callable=AsyncMock)
+    async def test_plan_with_error_in_stream(self, mock_build_var_file, client):
         """Test terraform plan with error occurring during streaming."""
-        # Mock the var file to exist
-        mock_get_var_file.return_value = Path("/test/tfvars.d/test.tfvars.json")
-        
-        # Mock streaming that raises an error after yielding some output
-        mock_stream_plan.return_value = MockAsyncGenerator([
-            "Initializing the backend...\n",
-            "Terraform will perform the following actions:\n",
-        ], raise_error_after=2)
-        
-        async with AsyncClient(app=app, base_url="http://test") as ac:
-            response = await ac.post("/projects/test-project/workspaces/test/plan")
-        
+        stream = fake_stream(
+            [
+                b"Initializing the backend...\n",
+                b"Terraform will perform the following actions:\n",
+            ],
+            error="Terraform error detected in stream",
+        )
+
+        with patch("app.api.v1.terraforms.stream_terraform_plan", stream):
+            response = await client.post("/projects/test-project/workspaces/test/plan")
+
         # Should still return 200 because streaming has started
         assert response.status_code == 200
         # Should contain the partial output and the error message
         assert "Initializing the backend" in response.text
         assert "ERROR: Terraform error detected in stream" in response.text
 
-    @patch("app.api.v1.terraforms.get_var_file")
-    @patch("app.api.v1.terraforms.get_db_session")
-    async def test_plan_var_file_not_found(self, mock_db, mock_get_var_file):
+    @pytest.mark.anyio
+    @patch("app.api.v1.terraforms.build_var_file", new_callable=AsyncMock)
+    async def test_plan_var_file_not_found(self, mock_build_var_file, client):
         """Test terraform plan when var file is not found."""
-        # Mock the var file to not exist
-        mock_get_var_file.side_effect = FileNotFoundError("Var file does not exist")
-        
-        async with AsyncClient(app=app, base_url="http://test") as ac:
-            response = await ac.post("/projects/test-project/workspaces/test/plan")
-        
+        mock_build_var_file.side_effect = FileNotFoundError("Var file does not exist")
+
+        response = await client.post("/projects/test-project/workspaces/test/plan")
+
         assert response.status_code == 404
         assert "Var file not found" in response.json()["detail"]
 
-    @patch("app.api.v1.terraforms.stream_terraform_plan")
-    @patch("app.api.v1.terraforms.get_var_file")
-    @patch("app.api.v1.terraforms.get_db_session")
-    async def test_plan_with_variables(self, mock_db, mock_get_var_file, mock_stream_plan):
+    @pytest.mark.anyio
+    @patch("app.api.v1.terraforms.build_var_file", new_callable=AsyncMock)
+    async def test_plan_var_file_error_keeps_its_status(self, mock_build_var_file, client):
+        """Test that an application error while building the var file is not wrapped."""
+        mock_build_var_file.side_effect = ServiceError("Database unavailable", 503)
+
+        response = await client.post("/projects/test-project/workspaces/test/plan")
+
+        assert response.status_code == 503
+        assert response.json() == {"detail": "Database unavailable"}
+
+    @pytest.mark.anyio
+    @patch("app.api.v1.terraforms.get_var_file", new_callable=AsyncMock)
+    @patch("app.api.v1.terraforms.build_var_file", new_callable=AsyncMock)
+    async def test_plan_with_variables(self, mock_build_var_file, mock_get_var_file, client):
         """Test terraform plan with variables provided."""
-        # Mock successful streaming
-        mock_stream_plan.return_value = MockAsyncGenerator([
-            "Initializing the backend...\n",
-            "Plan: 1 to add, 0 to change, 0 to destroy.\n"
+        stream = fake_stream([
+            b"Initializing the backend...\n",
+            b"Plan: 1 to add, 0 to change, 0 to destroy.\n",
         ])
-        
         variables = {"key1": "value1", "key2": 42}
-        
-        async with AsyncClient(app=app, base_url="http://test") as ac:
-            response = await ac.post(
+
+        with patch("app.api.v1.terraforms.stream_terraform_plan", stream):
+            response = await client.post(
                 "/projects/test-project/workspaces/test/plan",
-                json=variables
+                params={"from_db": False},
+                json=variables,
             )
-        
+
         assert response.status_code == 200
         assert "Plan: 1 to add" in response.text
-        # Should not call get_var_file when variables are provided
-        mock_get_var_file.assert_not_called()
+        assert stream.call_args.kwargs["vars"] == variables
+        # The var file is not needed when variables are provided
+        mock_build_var_file.assert_not_awaited()
+        mock_get_var_file.assert_not_awaited()
 
 
-@pytest.mark.asyncio
 class TestTerraformApplyAPI:
     """Tests for the /apply endpoint."""
 
-    @patch("app.api.v1.terraforms.stream_terraform_apply")
-    async def test_apply_with_error_in_stream(self, mock_stream_apply):
+    @pytest.mark.anyio
+    @patch("app.api.v1.terraforms.background_queue")
+    @patch("app.api.v1.terraforms.build_var_file", new_callable=AsyncMock)
+    async def test_apply_successful_stream(self, mock_build_var_file, mock_queue, client):
+        """Test successful terraform apply, which queues the inventory sync."""
+        stream = fake_stream([
+            b"Applying terraform...\n",
+            b"Apply complete! Resources: 1 added, 0 changed, 0 destroyed.\n",
+        ])
+
+        with patch("app.api.v1.terraforms.stream_terraform_apply", stream):
+            response = await client.post("/projects/test-project/workspaces/test/apply")
+
+        assert response.status_code == 200
+        assert "Apply complete!" in response.text
+        mock_build_var_file.assert_awaited_once()
+        mock_queue.submit.assert_called_once()
+
+    @pytest.mark.anyio
+    @patch("app.api.v1.terraforms.background_queue")
+    @patch("app.api.v1.terraforms.build_var_file", new_callable=AsyncMock)
+    async def test_apply_with_error_in_stream(self, mock_build_var_file, mock_queue, client):
         """Test terraform apply with error occurring during streaming."""
-        # Mock streaming that raises an error
-        mock_stream_apply.return_value = MockAsyncGenerator([
-            "Applying terraform...\n",
-        ], raise_error_after=1)
-        
-        async with AsyncClient(app=app, base_url="http://test") as ac:
-            response = await ac.post("/projects/test-project/workspaces/test/apply")
-        
+        stream = fake_stream(
+            [b"Applying terraform...\n"], error="Terraform error detected in stream"
+        )
+
+        with patch("app.api.v1.terraforms.stream_terraform_apply", stream):
+            response = await client.post("/projects/test-project/workspaces/test/apply")
+
         # Should still return 200 because streaming has started
         assert response.status_code == 200
         # Should contain the error message
         assert "ERROR: Terraform error detected in stream" in response.text
+        mock_queue.submit.assert_not_called()
 
 
-@pytest.mark.asyncio
 class TestTerraformDestroyAPI:
     """Tests for the /destroy endpoint."""
 
-    @patch("app.api.v1.terraforms.stream_terraform_destroy")
-    async def test_destroy_with_error_in_stream(self, mock_stream_destroy):
+    @pytest.mark.anyio
+    @patch("app.api.v1.terraforms.logger")
+    @patch("app.api.v1.terraforms.background_queue")
+    async def test_destroy_with_error_in_stream(
+        self, mock_queue, mock_logger, client
+    ):
         """Test terraform destroy with error occurring during streaming."""
-        # Mock streaming that raises an error
-        mock_stream_destroy.return_value = MockAsyncGenerator([
-            "Destroying terraform resources...\n",
-        ], raise_error_after=1)
-        
-        async with AsyncClient(app=app, base_url="http://test") as ac:
-            response = await ac.post("/projects/test-project/workspaces/test/destroy")
-        
+        stream = fake_stream(
+            [b"Destroying terraform resources...\n"],
+            error="Terraform error detected in stream",
+        )
+
+        with patch("app.api.v1.terraforms.stream_terraform_destroy", stream):
+            response = await client.post("/projects/test-project/workspaces/test/destroy")
+
         # Should still return 200 because streaming has started
         assert response.status_code == 200
         # Should contain the error message
         assert "ERROR: Terraform error detected in stream" in response.text
+        mock_queue.submit.assert_not_called()
+        mock_logger.error.assert_called_once_with(
+            "Terraform destroy failed for test-project/test: "
+            "Terraform error detected in stream"
+        )
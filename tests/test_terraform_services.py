@@ -1,12 +1,15 @@
+import os
+
 import pytest
 import asyncio
 from pathlib import Path
 from unittest.mock import AsyncMock, Mock, patch
 from app.services.terraform_services import (
+    STREAM_CHUNK_SIZE,
     _set_workspace,
     execute_terraform_command,
+    init_lock,
     stream_terraform,
-    stream_terraform_init,
     stream_terraform_plan,
     stream_terraform_apply,
     stream_terraform_destroy,
@@ -65,9 +68,8 @@ class TestStreamTerraform:
     async def test_stream_terraform_success(self, mock_logger, mock_subprocess):
         # Arrange
         mock_stdout = AsyncMock()
-        mock_stdout.readline.side_effect = [
-            b"Line 1\n",
-            b"Line 2\n", 
+        mock_stdout.read.side_effect = [
+            b"Line 1\nLine 2\n",
             b"Line 3\n",
             b""  # End of stream
         ]
@@ -93,7 +95,8 @@ class TestStreamTerraform:
             stderr=asyncio.subprocess.STDOUT,
         )
         mock_logger.info.assert_called_once_with(f"Executing command: {command} from {project_path}")
-        assert lines == ["Line 1\n", "Line 2\n", "Line 3\n"]
+        mock_stdout.read.assert_awaited_with(STREAM_CHUNK_SIZE)
+        assert lines == [b"Line 1\nLine 2\n", b"Line 3\n"]
 
     @pytest.mark.anyio
     @patch("app.services.terraform_services.asyncio.create_subprocess_shell")
@@ -118,10 +121,9 @@ class TestStreamTerraform:
     async def test_stream_terraform_error_detected_in_output(self, mock_logger, mock_subprocess):
         # Arrange
         mock_stdout = AsyncMock()
-        mock_stdout.readline.side_effect = [
-            b"Starting terraform...\n",
-            b"Error: Resource not found\n", 
-            b"Additional error details\n",
+        mock_stdout.read.side_effect = [
+            b"Starting terraform...\nError: Resource",
+            b" not found\nAdditional error details\n",
             b""  # End of stream
         ]
         
@@ -142,6 +144,61 @@ class TestStreamTerraform:
         # Assert error was logged
         mock_logger.error.assert_any_call("Error detected in terraform output: Error: Resource not found")
 
+    @pytest.mark.anyio
+    @patch("app.services.terraform_services.asyncio.create_subprocess_shell")
+    @patch("app.services.terraform_services.logger")
+    async def test_stream_terraform_callbacks(self, mock_logger, mock_subprocess):
+        # Arrange
+        mock_stdout = AsyncMock()
+        mock_stdout.read.side_effect = [b"Applying...\n", b"Error: boom\n", b""]
+
+        mock_proc = AsyncMock()
+        mock_proc.stdout = mock_stdout
+        mock_proc.returncode = 1
+        mock_subprocess.return_value = mock_proc
+
+        seen = []
+
+        # Act
+        lines = []
+        async for line in stream_terraform(
+            Path("/test"),
+            "terraform apply",
+            on_chunk=seen.append,
+            on_error=lambda e: f"ERROR: {e}".encode(),
+        ):
+            lines.append(line)
+
+        # Assert
+        assert seen == [b"Applying...\n", b"Error: boom\n"]
+        assert lines[:2] == seen
+        assert lines[2].startswith(b"ERROR: Command failed with exit code 1")
+
+    @pytest.mark.anyio
+    @patch("app.services.terraform_services.asyncio.create_subprocess_shell")
+    async def test_stream_terraform_on_chunk_stops_after_true(self, mock_subprocess):
+        # Arrange
+        mock_stdout = AsyncMock()
+        mock_stdout.read.side_effect = [b"one\n", b"Apply complete!\n", b"outputs\n", b""]
+
+        mock_proc = AsyncMock()
+        mock_proc.stdout = mock_stdout
+        mock_proc.returncode = 0
+        mock_subprocess.return_value = mock_proc
+
+        seen = []
+
+        def on_chunk(chunk):
+            seen.append(chunk)
+            return b"complete" in chunk
+
+        # Act
+        lines = [line async for line in stream_terraform(Path("/test"), "terraform apply", on_chunk=on_chunk)]
+
+        # Assert
+        assert seen == [b"one\n", b"Apply complete!\n"]
+        assert lines == [b"one\n", b"Apply complete!\n", b"outputs\n"]
+
 
 class TestSetWorkspace:
     @pytest.mark.anyio
@@ -165,34 +222,29 @@ class TestSetWorkspace:
         assert result == "Switched to workspace 'development'"
 
 
-class TestStreamTerraformInit:
-    @pytest.mark.anyio
-    @patch("app.services.terraform_services.stream_terraform")
-    @patch("app.services.terraform_services._set_workspace")
-    @patch("app.services.terraform_services.logger")
-    async def test_stream_terraform_init_success(self, mock_logger, mock_set_workspace, mock_stream):
+class TestInitLock:
+    def test_lock_per_directory_without_plugin_cache(self):
         # Arrange
-        mock_set_workspace.return_value = "Switched to workspace 'dev'"
-        
-        async def mock_stream_generator():
-            yield "Initializing...\n"
-            yield "Terraform initialized!\n"
-        
-        mock_stream.return_value = mock_stream_generator()
-        
-        project_path = Path("/test/project")
-        workspace = "dev"
-        
-        # Act
-        lines = []
-        async for line in stream_terraform_init(project_path, workspace):
-            lines.append(line)
-        
+        with patch.dict(os.environ):
+            os.environ.pop("TF_PLUGIN_CACHE_DIR", None)
+
+            # Act
+            first = init_lock(Path("/projects/a"))
+            second = init_lock(Path("/projects/b"))
+
+            # Assert
+            assert first is not second
+            assert init_lock(Path("/projects/a")) is first
+
+    def test_single_lock_with_plugin_cache(self):
+        # Arrange
+        with patch.dict(os.environ, {"TF_PLUGIN_CACHE_DIR": "/tmp/plugin-cache"}):
+            # Act
+            first = init_lock(Path("/projects/a"))
+            second = init_lock(Path("/projects/b"))
+
         # Assert
-        mock_set_workspace.assert_awaited_once_with(project_path, workspace)
-        mock_stream.assert_called_once_with(project_path, "terraform init")
-        mock_logger.info.assert_called_once_with("Switched to workspace 'dev'")
-        assert lines == ["Initializing...\n", "Terraform initialized!\n"]
+        assert first is second
 
 
 class TestStreamTerraformPlan:
@@ -207,7 +259,7 @@ class TestStreamTerraformPlan:
         mock_get_var_file.return_value = Path("/test/prod.tfvars")
         
         async def mock_stream_generator():
-            yield "Plan output\n"
+            yield b"Plan output\n"
         
         mock_stream.return_value = mock_stream_generator()
         
@@ -217,8 +269,8 @@ class TestStreamTerraformPlan:
             lines.append(line)
         
         # Assert
-        mock_stream.assert_called_once_with(Path("/test"), "terraform plan -var-file=/test/prod.tfvars")
-        assert lines == ["Plan output\n"]
+        mock_stream.assert_called_once_with(Path("/test"), "terraform plan -var-file=/test/prod.tfvars", on_chunk=None, on_error=None)
+        assert lines == [b"Plan output\n"]
 
     @pytest.mark.anyio
     @patch("app.services.terraform_services.stream_terraform")
@@ -240,7 +292,7 @@ class TestStreamTerraformPlan:
             pass
         
         # Assert
-        mock_stream.assert_called_once_with(Path("/test"), "terraform plan -var-file=/test/vars.tfvars")
+        mock_stream.assert_called_once_with(Path("/test"), "terraform plan -var-file=/test/vars.tfvars", on_chunk=None, on_error=None)
 
     @pytest.mark.anyio
     @patch("app.services.terraform_services.stream_terraform")
@@ -264,7 +316,7 @@ class TestStreamTerraformPlan:
             pass
         
         # Assert
-        mock_stream.assert_called_once_with(Path("/test"), "terraform plan -var-file=/test/prod.tfvars -out=/test/plan.out")
+        mock_stream.assert_called_once_with(Path("/test"), "terraform plan -var-file=/test/prod.tfvars -out=/test/plan.out", on_chunk=None, on_error=None)
 
     @pytest.mark.anyio
     @patch("app.services.terraform_services.stream_terraform")
@@ -288,7 +340,7 @@ class TestStreamTerraformPlan:
         
         # Assert
         expected_command = "terraform plan -var-file=/test/vars.tfvars -out=/test/plan.out"
-        mock_stream.assert_called_once_with(Path("/test"), expected_command)
+        mock_stream.assert_called_once_with(Path("/test"), expected_command, on_chunk=None, on_error=None)
 
 
 class TestStreamTerraformApply:
@@ -312,7 +364,7 @@ class TestStreamTerraformApply:
             pass
         
         # Assert
-        mock_stream.assert_called_once_with(Path("/test"), "terraform apply -auto-approve -var-file=/test/tfvars.d/prod.tfvars.json")
+        mock_stream.assert_called_once_with(Path("/test"), "terraform apply -auto-approve -var-file=/test/tfvars.d/prod.tfvars.json", on_chunk=None, on_error=None)
 
     @pytest.mark.anyio
     @patch("app.services.terraform_services.stream_terraform")
@@ -337,7 +389,7 @@ class TestStreamTerraformApply:
         
         # Assert
         expected_command = "terraform apply -auto-approve -var-file=/test/vars.tfvars"
-        mock_stream.assert_called_once_with(Path("/test"), expected_command)
+        mock_stream.assert_called_once_with(Path("/test"), expected_command, on_chunk=None, on_error=None)
 
     @pytest.mark.anyio
     @patch("app.services.terraform_services.stream_terraform")
@@ -362,7 +414,7 @@ class TestStreamTerraformApply:
         
         # Assert
         expected_command = "terraform apply -auto-approve -var-file=/test/tfvars.d/prod.tfvars.json /test/plan.out"
-        mock_stream.assert_called_once_with(Path("/test"), expected_command)
+        mock_stream.assert_called_once_with(Path("/test"), expected_command, on_chunk=None, on_error=None)
 
     @pytest.mark.anyio
     @patch("app.services.terraform_services.stream_terraform")
@@ -386,7 +438,7 @@ class TestStreamTerraformApply:
         
         # Assert
         expected_command = "terraform apply -auto-approve -var-file=/test/vars.tfvars /test/plan.out"
-        mock_stream.assert_called_once_with(Path("/test"), expected_command)
+        mock_stream.assert_called_once_with(Path("/test"), expected_command, on_chunk=None, on_error=None)
 
 
 class TestStreamTerraformDestroy:
@@ -410,7 +462,7 @@ class TestStreamTerraformDestroy:
             pass
         
         # Assert
-        mock_stream.assert_called_once_with(Path("/test"), "terraform destroy -auto-approve -var-file=/test/tfvars.d/prod.tfvars.json")
+        mock_stream.assert_called_once_with(Path("/test"), "terraform destroy -auto-approve -var-file=/test/tfvars.d/prod.tfvars.json", on_chunk=None, on_error=None)
 
     @pytest.mark.anyio
     @patch("app.services.terraform_services.stream_terraform")
@@ -435,7 +487,7 @@ class TestStreamTerraformDestroy:
         
         # Assert
         expected_command = "terraform destroy -auto-approve -var-file=/test/vars.tfvars"
-        mock_stream.assert_called_once_with(Path("/test"), expected_command)
+        mock_stream.assert_called_once_with(Path("/test"), expected_command, on_chunk=None, on_error=None)
 
     @pytest.mark.anyio
     @patch("app.services.terraform_services.stream_terraform")
@@ -448,8 +500,8 @@ class TestStreamTerraformDestroy:
         mock_get_var_file.return_value = Path("/test/project/tfvars.d/production.tfvars.json")
         
         async def mock_stream_generator():
-            yield "Destroying resources...\n"
-            yield "Destroy complete!\n"
+            yield b"Destroying resources...\n"
+            yield b"Destroy complete!\n"
         
         mock_stream.return_value = mock_stream_generator()
         
@@ -464,5 +516,5 @@ class TestStreamTerraformDestroy:
         # Assert
         mock_set_workspace.assert_called_once_with(project_path, workspace)
         mock_logger.info.assert_called_once_with("Switched to workspace 'production'")
-        mock_stream.assert_called_once_with(project_path, "terraform destroy -auto-approve -var-file=/test/project/tfvars.d/production.tfvars.json")
-        assert lines == ["Destroying resources...\n", "Destroy complete!\n"]
+        mock_stream.assert_called_once_with(project_path, "terraform destroy -auto-approve -var-file=/test/project/tfvars.d/production.tfvars.json", on_chunk=None, on_error=None)
+        assert lines == [b"Destroying resources...\n", b"Destroy complete!\n"]
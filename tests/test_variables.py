@@ -0,0 +1,318 @@
+from collections import Counter
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.variables import router
+from app.databases.database import get_tx_session
+from app.databases.models import Variable, VariableType
+from app.repositories.variable_repository import VariableRepository
+from app.schemas.variable_schema import VariableCreate
+from app.services.variable_services import (
+    VariableService,
+    invalidate_deployment_variables,
+)
+
+
+@pytest.fixture
+def anyio_backend():
+    # SQLAlchemy's AsyncSession runs on asyncio only
+    return "asyncio"
+
+
+def count_by_group(variables):
+    """What the database returns for `VariableRepository.count_by_group`."""
+    counts = Counter(
+        (var.project_name, var.workspace_name, var.variable_type) for var in variables
+    )
+    sensitive = Counter(
+        (var.project_name, var.workspace_name, var.variable_type)
+        for var in variables
+        if var.is_sensitive
+    )
+    return [(*group, count, sensitive[group]) for group, count in counts.items()]
+
+
+@pytest.fixture
+def rows():
+    # What the database returns for the deployment variables query
+    return {"current": ["old"]}
+
+
+@pytest.fixture
+def app(rows):
+    app = FastAPI()
+    app.include_router(router)
+
+    async def tx_session():
+        # No statement is executed, so the session needs no connection
+        async with AsyncSession() as session, session.begin():
+            yield session
+            # A concurrent request reading between the route returning and
+            # the transaction committing still sees the old rows
+            await VariableService(session).get_deployment_variables("p", "w")
+
+    app.dependency_overrides[get_tx_session] = tx_session
+    return app
+
+
+class TestDeploymentVariablesCache:
+    @pytest.mark.anyio
+    async def test_read_after_write_returns_fresh_rows(self, app, rows):
+        # Arrange
+        invalidate_deployment_variables()
+        list_rows = AsyncMock(side_effect=lambda *args: rows["current"])
+        transport = httpx.ASGITransport(app=app)
+
+        with (
+            patch.object(VariableRepository, "list_deployment_variables", list_rows),
+            patch.object(
+                VariableService, "delete_variable", AsyncMock(return_value=True)
+            ),
+        ):
+            # Act
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://test"
+            ) as client:
+                response = await client.delete("/variables/1")
+            rows["current"] = ["new"]
+            result = await VariableService(AsyncSession()).get_deployment_variables(
+                "p", "w"
+            )
+
+        # Assert
+        assert response.status_code == 204
+        assert result == ["new"]
+
+
+class TestVariableStatistics:
+    @pytest.mark.anyio
+    async def test_statistics_match_seeded_rows(self):
+        # Arrange
+        variables = [
+            Variable(
+                key="region",
+                project_name="aws",
+                workspace_name=None,
+                variable_type=VariableType.PROJECT,
+                is_sensitive=False,
+            ),
+            Variable(
+                key="token",
+                project_name="aws",
+                workspace_name=None,
+                variable_type=VariableType.PROJECT,
+                is_sensitive=True,
+            ),
+            Variable(
+                key="size",
+                project_name="aws",
+                workspace_name="dev",
+                variable_type=VariableType.INSTANCE,
+                is_sensitive=False,
+            ),
+            Variable(
+                key="password",
+                project_name="aws",
+                workspace_name="prod",
+                variable_type=VariableType.INSTANCE,
+                is_sensitive=True,
+            ),
+            Variable(
+                key="zone",
+                project_name="gcp",
+                workspace_name="dev",
+                variable_type=VariableType.TERRAFORM,
+                is_sensitive=False,
+            ),
+        ]
+
+        # Act
+        with patch.object(
+            VariableRepository,
+            "count_by_group",
+            AsyncMock(return_value=count_by_group(variables)),
+        ):
+            stats = await VariableService(AsyncSession()).get_variable_statistics()
+
+        # Assert
+        assert stats == {
+            "total_variables": 5,
+            "projects": 2,
+            "workspaces": 2,
+            "sensitive_variables": 2,
+            "variable_types": {
+                VariableType.PROJECT: 2,
+                VariableType.INSTANCE: 2,
+                VariableType.TERRAFORM: 1,
+            },
+            "variables_by_project": {"aws": 4, "gcp": 1},
+            "variables_by_workspace": {"aws/dev": 1, "aws/prod": 1, "gcp/dev": 1},
+        }
+
+    @pytest.mark.anyio
+    async def test_count_by_group_counts_in_the_database(self):
+        # Arrange
+        session = MagicMock()
+        session.execute = AsyncMock(return_value=MagicMock())
+
+        # Act
+        await VariableRepository(session).count_by_group()
+
+        # Assert
+        sql = str(
+            session.execute.call_args.args[0].compile(dialect=postgresql.dialect())
+        )
+        assert "count(*) FILTER (WHERE variables.is_sensitive)" in sql
+        assert (
+            "GROUP BY variables.project_name, variables.workspace_name, "
+            "variables.variable_type" in sql
+        )
+
+
+class TestListDeploymentVariables:
+    @pytest.mark.anyio
+    async def test_orders_by_description_then_type(self):
+        # Arrange
+        session = MagicMock()
+        session.execute = AsyncMock(return_value=MagicMock())
+
+        # Act
+        await VariableRepository(session).list_deployment_variables("p", "w")
+
+        # Assert
+        sql = str(
+            session.execute.call_args.args[0].compile(dialect=postgresql.dialect())
+        )
+        order_by = sql.split("ORDER BY", 1)[1]
+        assert order_by.index("description") < order_by.index("CASE")
+        assert order_by.index("CASE") < order_by.index("variables.key")
+
+
+class TestImportVariablesFromShellScript:
+    @pytest.mark.anyio
+    async def test_bad_row_does_not_stop_the_import(self):
+        # Arrange
+        session = MagicMock()
+        session.rollback = AsyncMock()
+        written = []
+
+        async def create(schema):
+            written.append(schema.key)
+            return Variable(**schema.model_dump())
+
+        async def flush():
+            if written[-1] == "BAD_VALUE":
+                raise ValueError("value too long")
+
+        session.flush = AsyncMock(side_effect=flush)
+        shell_content = (
+            "export FIRST_VALUE=1\n" "export BAD_VALUE=2\n" "export LAST_VALUE=3\n"
+        )
+
+        with (
+            patch.object(
+                VariableRepository,
+                "get_by_key_and_project",
+                AsyncMock(return_value=None),
+            ),
+            patch.object(
+                VariableRepository, "create_from_schema", AsyncMock(side_effect=create)
+            ),
+        ):
+            # Act
+            result = await VariableService(session).import_variables_from_shell_script(
+                shell_content, "p", VariableType.PROJECT
+            )
+
+        # Assert
+        assert result["created"] == 2
+        assert [var.key for var in result["created_variables"]] == [
+            "FIRST_VALUE",
+            "LAST_VALUE",
+        ]
+        assert result["errors"] == ["Line 2: value too long"]
+        # Each row has its own savepoint; the request's transaction is left
+        # to the transactional session dependency
+        assert session.begin_nested.call_count == 3
+        session.rollback.assert_not_awaited()
+
+
+def variable_create(key, value="v"):
+    return VariableCreate(key=key, value=value, project_name="p")
+
+
+async def insert_rows(variables_data):
+    """What `VariableRepository.bulk_create` returns for the inserted rows."""
+    return [Variable(**var_data.model_dump()) for var_data in variables_data]
+
+
+class TestBulkImportVariables:
+    @pytest.mark.anyio
+    async def test_failed_bulk_insert_reports_only_the_failing_rows(self):
+        # Arrange
+        session = MagicMock()
+        session.flush = AsyncMock()
+
+        async def bulk_create(variables_data):
+            if any(var_data.key == "taken" for var_data in variables_data):
+                raise ValueError("duplicate key")
+            return await insert_rows(variables_data)
+
+        with (
+            patch.object(
+                VariableRepository,
+                "get_by_key_and_project",
+                AsyncMock(return_value=None),
+            ),
+            patch.object(
+                VariableRepository, "bulk_create", AsyncMock(side_effect=bulk_create)
+            ),
+        ):
+            # Act
+            result = await VariableService(session).bulk_import_variables(
+                [
+                    variable_create("first"),
+                    variable_create("taken"),
+                    variable_create("last"),
+                ]
+            )
+
+        # Assert
+        assert result["created"] == 2
+        assert [var.key for var in result["created_variables"]] == ["first", "last"]
+        assert result["errors"] == ["Error processing 'taken': duplicate key"]
+        # One savepoint for the batch, then one per variable
+        assert session.begin_nested.call_count == 4
+
+    @pytest.mark.anyio
+    async def test_repeated_key_with_overwrite_counts_as_updated(self):
+        # Arrange
+        session = MagicMock()
+        session.flush = AsyncMock()
+
+        with (
+            patch.object(
+                VariableRepository,
+                "get_by_key_and_project",
+                AsyncMock(return_value=None),
+            ),
+            patch.object(
+                VariableRepository, "bulk_create", AsyncMock(side_effect=insert_rows)
+            ),
+        ):
+            # Act
+            result = await VariableService(session).bulk_import_variables(
+                [variable_create("key", "old"), variable_create("key", "new")],
+                overwrite_existing=True,
+            )
+
+        # Assert
+        assert result["created"] == 1
+        assert result["updated"] == 1
+        assert result["errors"] == []
+        assert result["created_variables"][0].value == "new"
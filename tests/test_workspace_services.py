@@ -142,6 +142,12 @@ class TestCheckProjectInitialized:
         assert "Terraform configuration invalid" in str(exc_info.value)
 
 class TestCheckWorkspaceExists:
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        check_workspace_exists.cache.clear()
+        yield
+        check_workspace_exists.cache.clear()
+
     @pytest.mark.anyio
     @patch("app.services.workspace_services.check_project_exists", new_callable=AsyncMock)
     @patch("app.services.workspace_services.get_workspaces", new_callable=AsyncMock)
@@ -178,6 +184,25 @@ class TestCheckWorkspaceExists:
         
         assert "Workspace non-existent does not exist in project test-project" in str(exc_info.value)
 
+    @pytest.mark.anyio
+    @patch("app.services.workspace_services.execute_terraform_command", new_callable=AsyncMock)
+    @patch("app.services.workspace_services.check_project_exists", new_callable=AsyncMock)
+    @patch("app.services.workspace_services.get_workspaces", new_callable=AsyncMock)
+    async def test_check_workspace_exists_cached_until_deleted(self, mock_get_workspaces, mock_check_project_exists, mock_execute):
+        # Arrange
+        mock_get_workspaces.return_value = [WorkspaceOutput(name="development", active=True)]
+
+        # Act
+        await check_workspace_exists("test-project", "development")
+        await check_workspace_exists("test-project", "development")
+        await delete_workspace("test-project", "development")
+        mock_get_workspaces.return_value = []
+
+        # Assert
+        mock_get_workspaces.assert_awaited_once_with("test-project")
+        with pytest.raises(FileNotFoundError):
+            await check_workspace_exists("test-project", "development")
+
     @pytest.mark.anyio
     @patch("app.services.workspace_services.check_project_exists", new_callable=AsyncMock)
     async def test_check_workspace_exists_project_not_found(self, mock_check_project_exists):
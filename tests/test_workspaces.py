@@ -1,3 +1,4 @@
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, patch
 
 import pytest
@@ -252,8 +253,9 @@ class TestDeleteWorkspace:
 class TestGetDeploymentVars:
     @pytest.mark.anyio
     @patch("app.services.workspace_services.check_workspace_exists", new_callable=AsyncMock)
-    @patch("app.services.variable_services.VariableService")
-    async def test_get_deployment_vars_success(self, mock_variable_service_class, mock_check_workspace, mock_db_session):
+    @patch("app.api.v1.workspaces.get_database_manager")
+    @patch("app.api.v1.workspaces.VariableService")
+    async def test_get_deployment_vars_success(self, mock_variable_service_class, mock_get_database_manager, mock_check_workspace):
         # Arrange
         params = ProjectWorkspaceParams(project="test-project", workspace="test-workspace")
         
@@ -289,46 +291,94 @@ class TestGetDeploymentVars:
         # Mock the service
         mock_service = AsyncMock()
         mock_variable_service_class.return_value = mock_service
-        mock_service.get_variables_by_project.side_effect = [
-            [project_var],  # PROJECT variables
-            [instance_var]  # INSTANCE variables
-        ]
+        mock_service.get_deployment_variables.return_value = [project_var, instance_var]
         
         # Act
-        result = await get_deployment_vars(params, mock_db_session)
+        result = await get_deployment_vars(params, with_shebang=True, output_format="json")
         
         # Assert
         mock_check_workspace.assert_awaited_once_with("test-project", "test-workspace")
-        assert isinstance(result, DeploymentVarsResponse)
-        assert "#!/bin/bash" in result.content
-        assert "# SSO Google" in result.content
-        assert 'export GOOGLE_CLIENT_ID="test-client-id"' in result.content
-        assert "# Instance Configuration" in result.content
-        assert 'export INSTANCE_SIZE="t3.medium"' in result.content
+        content = DeploymentVarsResponse.model_validate_json(result.body).content
+        assert "#!/bin/bash" in content
+        assert "# SSO Google" in content
+        assert 'export GOOGLE_CLIENT_ID="test-client-id"' in content
+        assert "# Instance Configuration" in content
+        assert 'export INSTANCE_SIZE="t3.medium"' in content
 
     @pytest.mark.anyio
     @patch("app.services.workspace_services.check_workspace_exists", new_callable=AsyncMock)
-    async def test_get_deployment_vars_workspace_not_found(self, mock_check_workspace, mock_db_session):
+    @patch("app.api.v1.workspaces.get_database_manager")
+    @patch("app.api.v1.workspaces.VariableService")
+    async def test_get_deployment_vars_description_shared_by_both_types(self, mock_variable_service_class, mock_get_database_manager, mock_check_workspace):
+        # Arrange
+        params = ProjectWorkspaceParams(project="test-project", workspace="test-workspace")
+        # Rows as ordered by the query: description, then PROJECT before INSTANCE
+        rows = [
+            SimpleNamespace(key="IMAGE", value="debian", description="Compute"),
+            SimpleNamespace(key="REGION", value="eu-west-3", description="Network"),
+            SimpleNamespace(key="REGION", value="us-east-1", description="Network"),
+        ]
+        mock_service = AsyncMock()
+        mock_variable_service_class.return_value = mock_service
+        mock_service.get_deployment_variables.return_value = rows
+
+        # Act
+        result = await get_deployment_vars(params, with_shebang=False, output_format="json")
+
+        # Assert
+        content = DeploymentVarsResponse.model_validate_json(result.body).content
+        assert content == (
+            "\n# Compute"
+            '\nexport IMAGE="debian"\n'
+            "\n# Network"
+            '\nexport REGION="eu-west-3"'
+            '\nexport REGION="us-east-1"\n'
+        )
+
+    @pytest.mark.anyio
+    @patch("app.services.workspace_services.check_workspace_exists", new_callable=AsyncMock)
+    async def test_get_deployment_vars_workspace_not_found(self, mock_check_workspace):
         # Arrange
         params = ProjectWorkspaceParams(project="test-project", workspace="non-existent")
         mock_check_workspace.side_effect = FileNotFoundError("Workspace does not exist")
         
         # Act & Assert
         with pytest.raises(HTTPException) as exc_info:
-            await get_deployment_vars(params, mock_db_session)
+            await get_deployment_vars(params)
         
         assert exc_info.value.status_code == 404
         assert "Workspace does not exist" in str(exc_info.value.detail)
 
+    @pytest.mark.anyio
+    @patch("app.services.workspace_services.check_workspace_exists", new_callable=AsyncMock)
+    @patch("app.api.v1.workspaces.get_database_manager")
+    @patch("app.api.v1.workspaces.VariableService")
+    async def test_get_deployment_vars_shell_format(self, mock_variable_service_class, mock_get_database_manager, mock_check_workspace):
+        # Arrange
+        params = ProjectWorkspaceParams(project="test-project", workspace="test-workspace")
+        mock_service = AsyncMock()
+        mock_variable_service_class.return_value = mock_service
+        mock_service.get_deployment_variables.return_value = []
+
+        # Act
+        result = await get_deployment_vars(
+            params, with_shebang=True, output_format="shell"
+        )
+
+        # Assert
+        assert result.media_type == "text/x-shellscript"
+        assert [chunk async for chunk in result.body_iterator] == [b"#!/bin/bash"]
+
     def test_get_deployment_vars_endpoint_success(self, client):
         # Arrange & Act
         with patch("app.services.workspace_services.check_workspace_exists", new_callable=AsyncMock), \
-             patch("app.services.variable_services.VariableService") as mock_service_class:
+             patch("app.api.v1.workspaces.get_database_manager"), \
+             patch("app.api.v1.workspaces.VariableService") as mock_service_class:
             
             # Mock variables
             mock_service = AsyncMock()
             mock_service_class.return_value = mock_service
-            mock_service.get_variables_by_project.side_effect = [[], []]  # Empty variables
+            mock_service.get_deployment_variables.return_value = []  # Empty variables
             
             response = client.get("/projects/test-project/workspaces/test-workspace/deployment-vars")
         
@@ -337,8 +387,3 @@ class TestGetDeploymentVars:
         result = response.json()
         assert "content" in result
         assert "#!/bin/bash" in result["content"]
-
-
-@pytest.fixture
-def mock_db_session():
-    return AsyncMock()